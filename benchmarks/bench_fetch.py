@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.stub_site import StubSite
+from utils.cache import PageCache
+from utils.extract import scrape_fashion
+
+PAGES = 50
+LATENCY = 0.05
+
+
+def run(label, site=None, **kwargs):
+    if site is None:
+        with StubSite(pages=PAGES, latency=LATENCY) as site:
+            return run(label, site, **kwargs)
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        products = scrape_fashion(PAGES, base_url=site.base_url, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.2f}s  {len(products)} products")
+    return products
+
+
+if __name__ == "__main__":
+    serial = run("serial (delay=0.5)", delay=0.5)
+    no_delay = run("serial (delay=0)", delay=0)
+    concurrent = run("concurrent x8 (20 req/s)", concurrency=8, rate_limit=20, burst=8)
+    unlimited = run("concurrent x8 (no limit)", delay=0, concurrency=8)
+
+    with tempfile.TemporaryDirectory() as tmp, StubSite(pages=PAGES, latency=LATENCY) as site:
+        cache = PageCache(os.path.join(tmp, "pages.sqlite"))
+        run("concurrent x8, cold cache", site, delay=0, concurrency=8, cache=cache)
+        cached = run("concurrent x8, warm cache", site, delay=0, concurrency=8, cache=cache)
+        print(f"page cache: {cache.summary()}")
+        cache.close()
+
+    strip = lambda rows: [{k: v for k, v in row.items() if k != 'ScrapedAt'} for row in rows]
+    assert strip(serial) == strip(no_delay) == strip(concurrent) == strip(unlimited) == strip(cached)
+    print("outputs identical")
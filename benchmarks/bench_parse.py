@@ -0,0 +1,29 @@
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.extract import PARSERS, parse_page
+
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures')
+ROUNDS = 20
+
+
+def strip(rows):
+    return [{k: v for k, v in row.items() if k != 'ScrapedAt'} for row in rows]
+
+
+if __name__ == "__main__":
+    pages = [open(path, 'rb').read() for path in sorted(glob.glob(os.path.join(FIXTURES, 'page*.html')))]
+    expected = None
+    for name in PARSERS:
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            rows = [row for page_num, body in enumerate(pages, 1) for row in parse_page(body, page_num, name)]
+        elapsed = (time.perf_counter() - start) / (ROUNDS * len(pages))
+        print(f"{name:<6} {elapsed * 1000:8.2f} ms/page  {len(rows)} products")
+        if expected is None:
+            expected = strip(rows)
+        assert strip(rows) == expected, f"{name} output differs"
+    print("outputs identical")
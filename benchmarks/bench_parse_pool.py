@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.stub_site import render_page
+from utils.extract import parse_pages
+
+PAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+PARSER = sys.argv[2] if len(sys.argv) > 2 else 'bs4'
+
+
+def strip(results):
+    return [(page_num, [{k: v for k, v in row.items() if k != 'ScrapedAt'} for row in rows]) for page_num, rows in results]
+
+
+if __name__ == "__main__":
+    corpus = [(page_num, render_page(page_num)) for page_num in range(1, PAGES + 1)]
+    cores = os.cpu_count() or 1
+    print(f"{PAGES} pages, parser={PARSER}, {cores} cores")
+    counts = sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)) or {1})
+    expected = None
+    for workers in counts:
+        start = time.perf_counter()
+        with redirect_stdout(StringIO()):
+            results = list(parse_pages(iter(corpus), PARSER, workers=workers, chunksize=8))
+        elapsed = time.perf_counter() - start
+        print(f"workers={workers:<3} {elapsed:7.2f}s  {PAGES / elapsed:8.1f} pages/s")
+        if expected is None:
+            expected = strip(results)
+        assert strip(results) == expected, "output differs from the serial path"
+    print("outputs identical and in page order")
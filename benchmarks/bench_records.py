@@ -0,0 +1,65 @@
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.stub_site import render_page
+from utils.extract import DEFAULT_PARSER, get_parser, extract_product, extract_product_lxml, parse_page
+from utils.records import records_to_frame
+
+EXTRACTORS = {'bs4': extract_product, 'lxml': extract_product_lxml}
+
+
+# the old representation: one dict and one timestamp per product, then a frame from the dicts
+def dict_rows(pages, parser):
+    find_cards, _ = get_parser(parser)
+    extract = EXTRACTORS[parser]
+    rows = []
+    for body in pages:
+        rows.extend(extract(card) for card in find_cards(body))
+    return rows
+
+def columnar_rows(pages, parser):
+    return [parse_page(body, page_num, parser) for page_num, body in enumerate(pages, 1)]
+
+
+def measure(build, to_frame, pages, parser):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    products = build(pages, parser)
+    held = tracemalloc.take_snapshot().statistics('filename')
+    frame = to_frame(products)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in held)
+    size = sum(stat.size for stat in held)
+    return frame, elapsed, peak, blocks, size
+
+
+if __name__ == "__main__":
+    PAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    parser = DEFAULT_PARSER
+    pages = [render_page(page_num) for page_num in range(1, PAGES + 1)]
+    print(f"{PAGES} pages, parser {parser}, products held until the frame is built")
+
+    frames = {}
+    for name, build, to_frame in (
+        ('dicts', dict_rows, pd.DataFrame),
+        ('columns', columnar_rows, records_to_frame),
+    ):
+        frame, elapsed, peak, blocks, size = measure(build, to_frame, pages, parser)
+        frames[name] = frame
+        print(
+            f"{name:<8} {elapsed:7.2f} s  peak {peak / 2**20:7.1f} MiB  "
+            f"held {blocks:>9,} blocks / {size / 2**20:6.1f} MiB  {len(frame)} rows"
+        )
+
+    fields = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender']
+    assert frames['dicts'][fields].equals(frames['columns'][fields]), "extracted fields differ"
+    print("extracted fields identical")
@@ -0,0 +1,48 @@
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.stub_site import render_page
+from utils.archive import ArchiveWriter, PageArchive
+from utils.extract import page_url, parse_pages, scrape_fashion
+
+PAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+BASE_URL = 'http://stub/'
+
+
+def size_of(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+if __name__ == "__main__":
+    corpus = [(page_num, render_page(page_num)) for page_num in range(1, PAGES + 1)]
+    raw = sum(len(body) for _, body in corpus)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        with ArchiveWriter(tmp) as writer:
+            for page_num, body in corpus:
+                writer.add(page_url(page_num, BASE_URL), body)
+        print(f"record  {time.perf_counter() - start:6.2f}s  {raw / 2**20:6.1f} MiB raw -> {size_of(tmp) / 2**20:5.1f} MiB archived")
+
+        start = time.perf_counter()
+        with PageArchive(tmp) as archive:
+            for page_num, _ in corpus:
+                archive.get(page_url(page_num, BASE_URL))
+        print(f"lookup  {time.perf_counter() - start:6.2f}s  ({PAGES} random-access reads)")
+
+        start = time.perf_counter()
+        with redirect_stdout(StringIO()):
+            in_memory = [row for _, rows in parse_pages(iter(corpus), 'lxml') for row in rows]
+        parse_only = time.perf_counter() - start
+        print(f"parse   {parse_only:6.2f}s  in-memory corpus")
+
+        start = time.perf_counter()
+        with PageArchive(tmp) as archive, redirect_stdout(StringIO()):
+            replayed = scrape_fashion(PAGES, base_url=BASE_URL, archive=archive, parser='lxml')
+        replay = time.perf_counter() - start
+        print(f"replay  {replay:6.2f}s  {PAGES / replay:8.1f} pages/s ({replay / parse_only:.2f}x parse-only time)")
+        assert len(replayed) == len(in_memory)
@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.bench_transform import synthetic_products
+from utils.transform import clean_and_transform
+from utils.load import save_to_csv, save_to_parquet, read_parquet
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+
+def size_of(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        result = fn()
+    return time.perf_counter() - start, result
+
+
+def report(label, write, read, path):
+    write_time, _ = timed(write)
+    read_time, df = timed(read)
+    print(f"{label:<24} write {write_time:6.2f}s  read {read_time:6.2f}s  size {size_of(path) / 2**20:7.1f} MiB  "
+          f"ScrapedAt read back as {df['ScrapedAt'].dtype}, Size as {df['Size'].dtype}")
+
+
+if __name__ == "__main__":
+    with redirect_stdout(StringIO()):
+        default = clean_and_transform(synthetic_products(ROWS))
+        typed = clean_and_transform(synthetic_products(ROWS), typed=True)
+    print(f"{len(default)} rows")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "data.csv")
+        report("csv", lambda: save_to_csv(default, csv_path), lambda: pd.read_csv(csv_path), csv_path)
+        for compression in ("snappy", "zstd"):
+            path = os.path.join(tmp, f"parquet_{compression}")
+            report(f"parquet {compression}", lambda: save_to_parquet(default, path, compression=compression),
+                   lambda: read_parquet(path), path)
+        path = os.path.join(tmp, "parquet_typed")
+        report("parquet zstd (typed)", lambda: save_to_parquet(typed, path), lambda: read_parquet(path), path)
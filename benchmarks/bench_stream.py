@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from io import StringIO
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.stub_site import StubSite
+from utils.extract import scrape_fashion, scrape_fashion_pages
+from utils.transform import clean_and_transform, transform_chunks
+from utils.load import save_to_csv
+
+PAGES = 200
+CHUNK_SIZE = 200
+
+
+def batch(site, path):
+    start = time.perf_counter()
+    products = scrape_fashion(PAGES, delay=0, base_url=site.base_url, parser='lxml')
+    df = clean_and_transform(products)
+    save_to_csv(df, path)
+    return time.perf_counter() - start, len(df)
+
+
+def streaming(site, path):
+    start = time.perf_counter()
+    first = None
+    rows = 0
+    pages = scrape_fashion_pages(PAGES, delay=0, base_url=site.base_url, parser='lxml')
+    for i, df in enumerate(transform_chunks(pages, CHUNK_SIZE)):
+        save_to_csv(df, path, if_exists='replace' if i == 0 else 'append')
+        rows += len(df)
+        if first is None:
+            first = time.perf_counter() - start
+    return first, rows
+
+
+def measure(label, fn, site, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        first, rows = fn(site, path)
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<10} first rows after {first:6.2f}s  total {total:6.2f}s  peak {peak / 2**20:7.1f} MiB  {rows} rows")
+
+
+if __name__ == "__main__":
+    with StubSite(pages=PAGES, latency=0.005) as site, tempfile.TemporaryDirectory() as tmp:
+        measure("batch", batch, site, os.path.join(tmp, "batch.csv"))
+        measure("streaming", streaming, site, os.path.join(tmp, "stream.csv"))
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.transform import clean_and_transform
+
+def synthetic_products(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    price = np.char.add('$', np.round(rng.uniform(10, 500, rows), 2).astype(str)).astype(object)
+    price[rng.random(rows) < 0.05] = 'Price Unavailable'
+    rating = np.char.add('⭐ ', np.round(rng.uniform(1, 5, rows), 1).astype(str)).astype(object)
+    rating[rng.random(rows) < 0.05] = '⭐ Invalid Rating'
+    title = np.char.add('T-shirt ', np.arange(rows).astype(str)).astype(object)
+    title[rng.random(rows) < 0.05] = 'Unknown Product'
+    start = datetime(2025, 10, 18)
+    return pd.DataFrame({
+        'Title': title,
+        'Price': price,
+        'Rating': rating,
+        'Colors': rng.integers(1, 9, rows).astype(str).astype(object),
+        'Size': rng.choice(['S', 'M', 'L', 'XL', 'XXL'], rows).astype(object),
+        'Gender': rng.choice(['Men', 'Women', 'Unisex'], rows).astype(object),
+        'ScrapedAt': pd.Series([start + timedelta(milliseconds=int(ms)) for ms in rng.integers(0, 86_400_000, rows)]),
+    })
+
+
+# the pre-vectorization implementation, kept for comparison
+def legacy_clean_and_transform(product_data):
+    df = pd.DataFrame(product_data)
+    df.columns = [col.strip() for col in df.columns]
+    df = df[~df['Title'].str.lower().str.contains('unknown', na=False)]
+    df['Price'] = df['Price'].astype(str).str.replace(r'[^\d.]', '', regex=True)
+    df.dropna(subset=['Price'], inplace=True)
+    df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
+    df.dropna(subset=['Price'], inplace=True)
+    df['Price'] = (df['Price'] * 16000).round(1)
+    df['Rating'] = df['Rating'].astype(str).str.extract(r'(\d+\.\d+|\d+)')[0]
+    df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce').astype(float)
+    df.dropna(subset=['Rating'], inplace=True)
+    df['Colors'] = df['Colors'].astype(str).str.extract(r'(\d+)')[0]
+    df['Colors'] = pd.to_numeric(df['Colors'], errors='coerce')
+    df.dropna(subset=['Colors'], inplace=True)
+    df['Size'] = df['Size'].astype(str).str.replace(r'Size:\s*', '', regex=True)
+    df['Gender'] = df['Gender'].astype(str).str.replace(r'Gender:\s*', '', regex=True)
+    df['ScrapedAt'] = pd.to_datetime(df['ScrapedAt'], errors='coerce')
+    df.dropna(subset=['ScrapedAt'], inplace=True)
+    df['ScrapedAt'] = df['ScrapedAt'].dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str.slice(stop=-3)
+    df.drop_duplicates(inplace=True)
+    df.dropna(inplace=True)
+    return df
+
+
+def measure(label, fn, data):
+    start = time.perf_counter()
+    result = fn(data)
+    elapsed = time.perf_counter() - start
+
+    # separate run, tracemalloc slows the timed one down
+    tracemalloc.start()
+    fn(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<8} {elapsed:7.2f}s  peak {peak / 2**20:8.1f} MiB  {len(result)} rows")
+    return result
+
+
+if __name__ == "__main__":
+    ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    warnings.simplefilter('ignore')
+    data = synthetic_products(ROWS)
+    print(f"{ROWS} synthetic rows")
+    legacy = measure("legacy", legacy_clean_and_transform, data)
+    current = measure("current", clean_and_transform, data)
+    pd.testing.assert_frame_equal(legacy, current, check_dtype=False)
+    print("outputs identical")
@@ -0,0 +1,79 @@
+import os
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pytest
+from pytest_benchmark.utils import parse_compare_fail, parse_seconds
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.bench_transform import synthetic_products
+from utils.transform import clean_and_transform
+
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures')
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+# with --benchmark-gate, a benchmark whose median is twice as slow as the stored baseline fails the run;
+# on a shared vm even the median of 10 rounds drifts by 40-60% between identical runs, an algorithmic regression does not
+COMPARE_FAIL = 'median:100%'
+GATE_MIN_ROUNDS = 10
+GATE_MIN_TIME = '0.005'
+
+SIZES = {'1k': 1_000, '100k': 100_000, '1M': 1_000_000}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--benchmark-gate', action='store_true',
+        help=f"compare against the latest baseline in benchmarks/baselines/ and fail on a {COMPARE_FAIL} slowdown",
+    )
+
+# baselines are always stored in benchmarks/baselines/; the regression gate is opt-in with --benchmark-gate,
+# timings only mean something against a baseline recorded on the same machine, command line options still win
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    option = config.option
+    if not hasattr(option, 'benchmark_storage'):
+        return
+    if option.benchmark_storage == 'file://./.benchmarks':
+        option.benchmark_storage = 'file://' + BASELINES
+    if not config.getoption('benchmark_gate', False):
+        return
+    if option.benchmark_compare == []:
+        option.benchmark_compare = True
+    if option.benchmark_compare_fail is None:
+        option.benchmark_compare_fail = [parse_compare_fail(COMPARE_FAIL)]
+    option.benchmark_min_rounds = max(option.benchmark_min_rounds, GATE_MIN_ROUNDS)
+    option.benchmark_min_time = max(option.benchmark_min_time, parse_seconds(GATE_MIN_TIME))
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+# synthetic frames are generated once per session and shared by every benchmark
+_raw = {}
+_clean = {}
+
+def raw_products(rows: int):
+    if rows not in _raw:
+        _raw[rows] = synthetic_products(rows)
+    return _raw[rows]
+
+def clean_products(rows: int, typed: bool = False):
+    if (rows, typed) not in _clean:
+        with redirect_stdout(StringIO()):
+            _clean[rows, typed] = clean_and_transform(raw_products(rows), typed=typed)
+    return _clean[rows, typed]
+
+
+# rows per second next to the timings, so a throughput drop reads directly in the table
+def record_throughput(benchmark, rows: int):
+    benchmark.extra_info['rows'] = rows
+    if benchmark.stats is not None:
+        benchmark.extra_info['rows_per_second'] = round(rows / benchmark.stats.stats.mean)
+
+
+@pytest.fixture
+def pages():
+    return [read_fixture(f'page{n}.html') for n in (1, 2, 3)]
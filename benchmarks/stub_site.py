@@ -0,0 +1,112 @@
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# mimics the card markup served by fashion-studio.dicoding.dev
+CARD = """
+<div class="collection-card">
+    <div style="position: relative;"><img src="https://picsum.photos/280/350?random={n}" class="collection-image" alt="{title}"></div>
+    <div class="product-details">
+        <h3 class="product-title">{title}</h3>
+        <div class="price-container"><span class="price">{price}</span></div>
+        <p style="font-size: 14px; color: #777;">Rating: {rating} / 5</p>
+        <p style="font-size: 14px; color: #777;">{colors} Colors</p>
+        <p style="font-size: 14px; color: #777;">Size: {size}</p>
+        <p style="font-size: 14px; color: #777;">Gender: {gender}</p>
+    </div>
+</div>
+"""
+
+PAGE = """<!DOCTYPE html>
+<html><head><title>Fashion Studio</title></head>
+<body><div class="collection-grid" id="collectionList">{cards}</div>
+<ul class="pagination"><li class="page-item current"><span class="page-link">{page}</span></li></ul>
+</body></html>"""
+
+
+def render_page(page_num: int, cards: int = 20) -> bytes:
+    rnd = random.Random(page_num)
+    parts = []
+    for i in range(cards):
+        n = (page_num - 1) * cards + i
+        if rnd.random() < 0.05:
+            title, price, rating = "Unknown Product", "Price Unavailable", "⭐ Invalid Rating"
+        else:
+            title = f"{rnd.choice(['T-shirt', 'Hoodie', 'Pants', 'Jacket', 'Outerwear'])} {n}"
+            price = f"${rnd.uniform(10, 500):.2f}"
+            rating = f"⭐ {rnd.uniform(1, 5):.1f}"
+        parts.append(CARD.format(
+            n=n,
+            title=title,
+            price=price,
+            rating=rating,
+            colors=rnd.randint(1, 8),
+            size=rnd.choice(['S', 'M', 'L', 'XL', 'XXL']),
+            gender=rnd.choice(['Men', 'Women', 'Unisex']),
+        ))
+    return PAGE.format(cards="".join(parts), page=page_num).encode("utf-8")
+
+
+def _page_num(path: str) -> int:
+    path = path.strip("/")
+    if not path:
+        return 1
+    if path.startswith("page") and path[4:].isdigit():
+        return int(path[4:])
+    return 0
+
+
+class StubSite:
+    """Local HTTP server serving generated catalogue pages with an artificial latency."""
+
+    def __init__(self, pages: int = 50, latency: float = 0.05, cards: int = 20):
+        site = self
+        self.pages = pages
+        self.latency = latency
+        self.cards = cards
+        self.hits = 0
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site.hits += 1
+                page_num = _page_num(self.path)
+                time.sleep(site.latency)
+                if not 1 <= page_num <= site.pages:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = render_page(page_num, site.cards)
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
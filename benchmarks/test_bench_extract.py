@@ -0,0 +1,20 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from benchmarks.conftest import record_throughput
+from utils.extract import extract_product, parse_page, etree
+
+# card-level extraction on the fixture pages, soup parsing kept out of the timing
+def test_extract_product(benchmark, pages):
+    cards = [card for html in pages for card in BeautifulSoup(html, 'html.parser').find_all('div', class_='collection-card')]
+    products = benchmark(lambda: [extract_product(card) for card in cards])
+    assert products
+    record_throughput(benchmark, len(cards))
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+def test_parse_page(benchmark, pages, parser):
+    if parser == 'lxml' and etree is None:
+        pytest.skip('lxml is not installed')
+    products = benchmark(lambda: [parse_page(html, n, parser) for n, html in enumerate(pages, start=1)])
+    assert all(products)
+    record_throughput(benchmark, len(pages))
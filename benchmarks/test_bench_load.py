@@ -0,0 +1,107 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+
+from benchmarks.conftest import clean_products, record_throughput
+from utils.load import (
+    save_to_csv,
+    save_to_parquet,
+    save_to_postgresql,
+    save_to_postgresql_copy,
+    save_to_google_spreadsheet,
+    pa,
+)
+
+SINK_SIZES = {'1k': 1_000, '100k': 100_000}
+
+
+class DiscardCursor:
+    """psycopg2 cursor stand-in that drains the COPY stream and drops it."""
+
+    def __init__(self):
+        self.copied = 0
+        self.rowcount = -1
+
+    def execute(self, sql):
+        # every staged row counts as inserted, as with no repeated key
+        if sql.startswith('INSERT'):
+            self.rowcount = self.copied
+
+    def copy_expert(self, sql, file, size=65536):
+        self.copied = 0
+        while True:
+            data = file.read(size)
+            if not data:
+                break
+            self.copied += data.count(b'\n') if isinstance(data, bytes) else data.count('\n')
+
+    def close(self):
+        pass
+
+
+class DiscardSheets:
+    """Sheets client stand-in that serializes each request body like the real client would."""
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def clear(self, spreadsheetId, range):
+        return MagicMock()
+
+    def batchUpdate(self, spreadsheetId, body):
+        json.dumps(body)
+        return MagicMock()
+
+
+@pytest.fixture(params=SINK_SIZES)
+def rows(request):
+    return SINK_SIZES[request.param]
+
+
+def test_save_to_csv(benchmark, tmp_path, rows):
+    df = clean_products(rows)
+    result = benchmark(save_to_csv, df, str(tmp_path / 'data.csv'))
+    assert result.ok
+    record_throughput(benchmark, rows)
+
+@pytest.mark.skipif(pa is None, reason='pyarrow is not installed')
+def test_save_to_parquet(benchmark, tmp_path, rows):
+    df = clean_products(rows, typed=True)
+    result = benchmark(save_to_parquet, df, str(tmp_path / 'parquet'))
+    assert result.ok
+    record_throughput(benchmark, rows)
+
+# to_sql path against a local sqlite file standing in for postgres
+def test_save_to_postgresql(benchmark, tmp_path, rows):
+    df = clean_products(rows)
+    engine = create_engine(f"sqlite:///{tmp_path / 'bench.sqlite'}")
+    with patch('utils.load.get_engine', return_value=engine):
+        result = benchmark(save_to_postgresql, df)
+    engine.dispose()
+    assert result.ok
+    record_throughput(benchmark, rows)
+
+# copy path up to the wire: csv rendering and streaming, server side excluded
+def test_save_to_postgresql_copy(benchmark, rows):
+    df = clean_products(rows)
+    engine = MagicMock()
+    engine.begin.return_value.__enter__.return_value.connection.cursor.return_value = DiscardCursor()
+    with patch('utils.load.get_engine', return_value=engine):
+        result = benchmark(save_to_postgresql_copy, df)
+    assert result.ok
+    assert result.rows == len(df)
+    record_throughput(benchmark, rows)
+
+@pytest.mark.parametrize('diff', [False, True], ids=['full', 'diff'])
+def test_save_to_google_spreadsheet(benchmark, tmp_path, rows, diff):
+    df = clean_products(rows)
+    with patch('utils.load.get_sheets_service', return_value=DiscardSheets()), \
+         patch('utils.load.SHEETS_SNAPSHOT', str(tmp_path / 'snapshot.json')):
+        result = benchmark(save_to_google_spreadsheet, df, 'bench', diff=diff)
+    assert result.ok
+    record_throughput(benchmark, rows)
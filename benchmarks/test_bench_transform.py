@@ -0,0 +1,22 @@
+import pytest
+
+from benchmarks.conftest import SIZES, raw_products, record_throughput
+from utils.transform import clean_and_transform
+
+# the 1M case is slow, so it runs a fixed three rounds instead of calibrating
+def _run(benchmark, rows, typed):
+    data = raw_products(rows)
+    if rows >= 1_000_000:
+        df = benchmark.pedantic(clean_and_transform, args=(data, typed), rounds=3, iterations=1)
+    else:
+        df = benchmark(clean_and_transform, data, typed)
+    assert not df.empty
+    record_throughput(benchmark, rows)
+
+@pytest.mark.parametrize('size', SIZES)
+def test_clean_and_transform(benchmark, size):
+    _run(benchmark, SIZES[size], typed=False)
+
+@pytest.mark.parametrize('size', SIZES)
+def test_clean_and_transform_typed(benchmark, size):
+    _run(benchmark, SIZES[size], typed=True)
@@ -1,24 +1,242 @@
-from utils.extract import scrape_fashion
-from utils.transform import clean_and_transform
-from utils.load import load_data
+import argparse
+from utils.extract import scrape_fashion_frame, scrape_fashion_pages
+from utils.transform import clean_and_transform, transform_chunks, apply_typed_schema
+from utils.load import load_data, load_data_stream
+from utils.cache import PageCache
+from utils.state import IncrementalState
+from utils.archive import ArchiveWriter, PageArchive
+from utils.metrics import instrumented_run
+from utils.dedup import FingerprintIndex
+from utils.checkpoint import CrawlCheckpoint
+from utils.validate import Quarantine
+from utils.config import PipelineConfig
+from utils.shard import run_shards, merge_shards, shard_checkpoint_path
+from utils.scheduler import run_every
 
-def main():
-    print("Starting product scraping from 50 pages...")
-    all_products = scrape_fashion(pages=50, delay=0.5)
+def main(config: PipelineConfig = None, **options):
+    config = (config or PipelineConfig()).with_options(**options)
+    print(f"Starting product scraping from pages {config.start_page}-{config.pages}...")
+    state = IncrementalState() if config.incremental else None
+    # products already stored by any earlier run are dropped before loading, so the new ones are appended
+    index = FingerprintIndex() if config.dedup else None
+    if_exists = 'append' if config.incremental or config.dedup else 'replace'
+    try:
+        # per-stage timings and counters land in report_path, profile takes a cProfile dump
+        with instrumented_run(config.report_path, config.profile, config.trace_memory):
+            if config.shards > 1:
+                _run_sharded(config, state, index, if_exists)
+            else:
+                _run_single(config, state, index, if_exists)
+    finally:
+        if index is not None:
+            index.close()
+        if state is not None:
+            state.close()
 
-    if not all_products:
+def _run_single(config, state, index, if_exists):
+    cache = PageCache()
+    # progress is saved after every page, resume picks up the pages already finished
+    checkpoint = CrawlCheckpoint(resume=config.resume)
+    # record saves every raw page to an archive, replay re-runs extraction from one offline
+    recorder = ArchiveWriter(config.record) if config.record else None
+    archive = PageArchive(config.replay) if config.replay else None
+    try:
+        _run(config, cache, state, index, checkpoint, if_exists, recorder, archive)
+    finally:
+        checkpoint.close()
+        if recorder is not None:
+            recorder.close()
+            print(f"Recorded {recorder.recorded} pages to {config.record}")
+        if archive is not None:
+            archive.close()
+
+def _run(config, cache, state, index, checkpoint, if_exists, recorder, archive):
+    scrape_options = dict(
+        pages=config.pages, start_page=config.start_page, delay=config.delay, concurrency=config.concurrency,
+        rate_limit=config.rate_limit, cache=cache, state=state, parser=config.parser,
+        parse_workers=config.parse_workers, recorder=recorder, archive=archive, checkpoint=checkpoint
+    )
+
+    # streaming: pages flow through transform and load in fixed-size chunks
+    if config.streaming:
+        pages = scrape_fashion_pages(**scrape_options)
+        quarantine = Quarantine()
+        chunks = transform_chunks(pages, config.chunk_size, config.typed, quarantine)
+        if index is not None:
+            chunks = (index.filter(chunk) for chunk in chunks)
+        load_options = config.load_options()
+        report = load_data_stream(chunks, if_exists=if_exists, **load_options)
+        _report_quarantine(quarantine)
+        print(f"Page cache: {cache.summary()}")
+        if state is not None:
+            print(f"Incremental: {state.summary()}")
+        if index is not None:
+            print(f"Dedup: {index.summary()}")
+        print(report.summary())
+        _commit(report, state, index, [(checkpoint, config.start_page, config.pages)])
+        print("Data scraping and storage process completed.")
+        return
+
+    # the pages go straight into one frame, column by column
+    all_products = scrape_fashion_frame(**scrape_options)
+    print(f"Page cache: {cache.summary()}")
+    if state is not None:
+        print(f"Incremental: {state.summary()}")
+
+    if all_products.empty:
+        if state is not None:
+            state.commit()
+            print("No new or changed products since the last run.")
+            return
         print("No product data successfully retrieved. Program stopped.")
         return
 
     print(f"Number of products retrieved: {len(all_products)}")
 
     # transformation
-    cleaned_data = clean_and_transform(all_products)
+    quarantine = Quarantine()
+    cleaned_data = clean_and_transform(all_products, config.typed, quarantine)
+    _report_quarantine(quarantine)
+    _load(config, cleaned_data, state, index, if_exists, [(checkpoint, config.start_page, config.pages)])
+
+# every shard crawls and cleans its own page range in a separate process, the merged frame is loaded once
+def _run_sharded(config, state, index, if_exists):
+    results = run_shards(config)
+    quarantine = Quarantine()
+    for result in results:
+        quarantine.extend(result.quarantine)
+        if state is not None:
+            state.pending_pages.update(result.pending_pages)
+            state.pending_products.update(result.pending_products)
+    _report_quarantine(quarantine)
+
+    cleaned_data = merge_shards(results)
+    if cleaned_data.empty:
+        if state is not None:
+            state.commit()
+        print("No product data successfully retrieved. Program stopped.")
+        return
+    print(f"Number of products retrieved: {sum(result.products for result in results)}")
+    if config.typed:
+        cleaned_data = apply_typed_schema(cleaned_data)
+
+    checkpoints = [
+        (CrawlCheckpoint(shard_checkpoint_path(result.start_page, result.pages), resume=True), result.start_page, result.pages)
+        for result in results
+    ]
+    try:
+        _load(config, cleaned_data, state, index, if_exists, checkpoints)
+    finally:
+        for checkpoint, _, _ in checkpoints:
+            checkpoint.close()
 
-    # save data
-    load_data(cleaned_data)
+def _load(config, cleaned_data, state, index, if_exists, checkpoints):
+    if index is not None:
+        cleaned_data = index.filter(cleaned_data)
+        print(f"Dedup: {index.summary()}")
 
+    # save data, incremental runs only append the delta
+    report = load_data(cleaned_data, if_exists=if_exists, **config.load_options())
+    print(report.summary())
+    _commit(report, state, index, checkpoints)
     print("Data scraping and storage process completed.")
 
+# remember hashes and clear checkpoints only once the delta has been loaded everywhere
+def _commit(report, state, index, checkpoints):
+    if report.ok:
+        if state is not None:
+            state.commit()
+        if index is not None:
+            index.commit()
+        for checkpoint, start_page, pages in checkpoints:
+            _finish_checkpoint(checkpoint, pages, start_page)
+    else:
+        print("Some destinations failed, incremental state not updated and the checkpoint kept for --resume.")
+
+# rows that failed validation are kept with their reasons instead of being dropped silently
+def _report_quarantine(quarantine):
+    print(f"Validation: {quarantine.summary()}")
+    if len(quarantine):
+        quarantine.save()
+
+# a crawl that stopped early keeps its checkpoint for the next --resume
+def _finish_checkpoint(checkpoint, pages, start_page=1):
+    if checkpoint.finished(pages, start_page):
+        checkpoint.clear()
+    else:
+        print(f"Crawl stopped after page {checkpoint.last_page()}, run again with --resume to continue.")
+
+
+def page_range(text: str) -> tuple:
+    # "50" means pages 1-50, "10-50" an explicit range
+    first, _, last = text.partition('-')
+    return (int(first), int(last)) if last else (1, int(first))
+
+def timeouts(text: str) -> dict:
+    # "sheets=30,postgresql=60"
+    pairs = (item.split('=', 1) for item in text.split(',') if item)
+    return {name: float(seconds) for name, seconds in pairs}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape the fashion catalogue and load it.")
+    parser.add_argument('--config', help="json file with PipelineConfig fields, command line options override it")
+    parser.add_argument('--pages', type=page_range, help="last page, or a FIRST-LAST range")
+    parser.add_argument('--delay', type=float, help="seconds between pages in serial mode")
+    parser.add_argument('--concurrency', type=int, help="parallel page fetches, still paced by --rate-limit (1/delay by default), so raise that too")
+    parser.add_argument('--rate-limit', type=float, help="requests per second to the site, 1/delay by default, split evenly between shards")
+    parser.add_argument('--parser', choices=['bs4', 'lxml'])
+    parser.add_argument('--parse-workers', type=int, help="processes parsing pages in single-process mode")
+    parser.add_argument('--shards', type=int, help="worker processes, each crawling its own page range")
+    parser.add_argument('--sinks', type=lambda text: tuple(text.split(',')), help="comma-separated: csv,parquet,history,postgresql,sheets")
+    parser.add_argument('--credential-file', help="google service account json")
+    parser.add_argument('--filename-csv', help="csv sink path")
+    parser.add_argument('--parquet-path', help="parquet sink directory")
+    parser.add_argument('--history-path', help="history sink sqlite file")
+    parser.add_argument('--db-host')
+    parser.add_argument('--db-port', type=int)
+    parser.add_argument('--db-name')
+    parser.add_argument('--db-user', dest='user')
+    parser.add_argument('--db-password', dest='password', help="visible in the process list, prefer the --config file")
+    parser.add_argument('--table-name')
+    parser.add_argument('--pg-method', choices=['copy', 'to_sql'])
+    parser.add_argument('--spreadsheet-id')
+    parser.add_argument('--range-name', help="sheets range, e.g. Sheet1!A1")
+    parser.add_argument('--sheets-diff', action='store_true', default=None, help="only rewrite sheet rows that changed")
+    parser.add_argument('--timeouts', type=timeouts, help="per-sink seconds, e.g. sheets=30,postgresql=60")
+    parser.add_argument('--chunk-size', type=int, help="rows per chunk in streaming mode")
+    parser.add_argument('--incremental', action='store_true', default=None)
+    parser.add_argument('--streaming', action='store_true', default=None)
+    parser.add_argument('--typed', action='store_true', default=None)
+    parser.add_argument('--dedup', action='store_true', default=None)
+    parser.add_argument('--resume', action='store_true', default=None, help="continue from the last checkpointed page")
+    parser.add_argument('--record', help="save raw pages to this archive")
+    parser.add_argument('--replay', help="read pages from this archive instead of the site")
+    parser.add_argument('--report', dest='report_path', help="json run report path")
+    parser.add_argument('--profile', help="write a cProfile dump here")
+    parser.add_argument('--trace-memory', action='store_true', default=None)
+    parser.add_argument('--every', type=float, help="repeat the run every N seconds")
+    parser.add_argument('--runs', type=int, help="number of scheduled runs, forever by default")
+    return parser.parse_args(argv)
+
+def config_from_args(args) -> PipelineConfig:
+    options = {
+        name: value for name, value in vars(args).items()
+        if value is not None and name not in ('config', 'pages', 'sinks')
+    }
+    if args.pages is not None:
+        options['start_page'], options['pages'] = args.pages
+    if args.sinks is not None:
+        options['destinations'] = args.sinks
+    if args.config:
+        return PipelineConfig.from_file(args.config, **options)
+    return PipelineConfig(**options)
+
+def cli(argv=None):
+    config = config_from_args(parse_args(argv))
+    if config.every:
+        run_every(lambda: main(config), config.every, config.runs)
+    else:
+        main(config)
+
 if __name__ == "__main__":
-    main()
+    cli()
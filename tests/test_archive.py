@@ -0,0 +1,51 @@
+import pytest
+import sys
+import os
+
+# directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.archive import ArchiveWriter, PageArchive
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "archive")
+    with ArchiveWriter(path) as writer:
+        for n in range(50):
+            writer.add(f"http://stub/page{n}", f"<html>{n}</html>".encode() * 20)
+
+    with PageArchive(path) as archive:
+        assert len(archive) == 50
+        assert archive.get("http://stub/page7") == b"<html>7</html>" * 20
+        assert archive.get("http://stub/missing") is None
+        assert (archive.hits, archive.misses) == (1, 1)
+        assert sorted(archive.urls()) == sorted(f"http://stub/page{n}" for n in range(50))
+
+def test_records_are_compressed(tmp_path):
+    path = str(tmp_path / "archive")
+    body = b"<div class='collection-card'></div>" * 500
+    with ArchiveWriter(path) as writer:
+        writer.add("http://stub/", body)
+    assert os.path.getsize(os.path.join(path, "pages.bin")) < len(body) / 10
+
+def test_append_keeps_latest_body(tmp_path):
+    path = str(tmp_path / "archive")
+    with ArchiveWriter(path) as writer:
+        writer.add("http://stub/", b"v1")
+        writer.add("http://stub/page2", b"p2")
+    with ArchiveWriter(path) as writer:
+        writer.add("http://stub/", b"v2")
+
+    with PageArchive(path) as archive:
+        assert len(archive) == 2
+        assert archive.get("http://stub/") == b"v2"
+        assert archive.get("http://stub/page2") == b"p2"
+
+def test_rejects_foreign_index(tmp_path):
+    path = tmp_path / "archive"
+    path.mkdir()
+    (path / "pages.idx").write_bytes(b"not an index")
+    (path / "pages.bin").write_bytes(b"")
+    with pytest.raises(ValueError):
+        PageArchive(str(path))
+
+if __name__ == "__main__":
+    pytest.main(['-v', __file__])
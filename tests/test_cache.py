@@ -0,0 +1,53 @@
+import pytest
+import sys
+import os
+
+# directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.cache import PageCache
+
+@pytest.fixture
+def cache(tmp_path):
+    page_cache = PageCache(str(tmp_path / "pages.sqlite"), max_bytes=100)
+    yield page_cache
+    page_cache.close()
+
+def test_conditional_headers_empty_for_unknown_url(cache):
+    assert cache.conditional_headers("http://a/") == {}
+
+def test_store_and_hit(cache):
+    cache.store("http://a/", b"body", etag='"v1"', last_modified="Sat, 18 Oct 2025 09:00:00 GMT")
+    assert cache.conditional_headers("http://a/") == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Sat, 18 Oct 2025 09:00:00 GMT",
+    }
+    assert cache.hit("http://a/") == b"body"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_store_without_validators_is_not_cached(cache):
+    cache.store("http://a/", b"body")
+    assert cache.conditional_headers("http://a/") == {}
+    assert cache.misses == 1
+
+def test_lru_eviction(cache):
+    cache.store("http://a/", b"a" * 40, etag="a")
+    cache.store("http://b/", b"b" * 40, etag="b")
+    cache.hit("http://a/")
+    cache.store("http://c/", b"c" * 40, etag="c")
+
+    assert cache.hit("http://b/") is None
+    assert cache.hit("http://a/") == b"a" * 40
+    assert cache.size() <= 100
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "pages.sqlite")
+    first = PageCache(path)
+    first.store("http://a/", b"body", etag="a")
+    first.close()
+
+    second = PageCache(path)
+    assert second.hit("http://a/") == b"body"
+    second.close()
+
+if __name__ == "__main__":
+    pytest.main(['-v', __file__])
@@ -0,0 +1,65 @@
+import pytest
+import sys
+import os
+from datetime import datetime
+
+# directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.checkpoint import CrawlCheckpoint
+from utils.records import PageRecords
+
+URLS = {1: "http://stub/", 2: "http://stub/page2", 3: "http://stub/page3"}
+
+@pytest.fixture
+def products():
+    page = PageRecords(datetime(2025, 1, 1, 10, 30, 0, 123000))
+    page.append(("T-shirt 1", "$10.00", "⭐ 4.5", "3 Colors", None, "Men"))
+    return page
+
+def test_round_trip_keeps_timestamps(tmp_path, products):
+    path = str(tmp_path / "checkpoint.sqlite")
+    checkpoint = CrawlCheckpoint(path)
+    checkpoint.record(1, URLS[1], products)
+    checkpoint.record(2, URLS[2], PageRecords())
+    checkpoint.close()
+
+    checkpoint = CrawlCheckpoint(path, resume=True)
+    restored = checkpoint.completed(URLS)
+    assert list(restored) == [1, 2]
+    assert list(restored[1]) == list(products)
+    assert restored[1].scraped_at == products.scraped_at
+    assert len(restored[2]) == 0
+    assert checkpoint.last_page() == 2
+    assert not checkpoint.finished(3)
+    checkpoint.close()
+
+def test_fresh_run_forgets_previous_crawl(tmp_path, products):
+    path = str(tmp_path / "checkpoint.sqlite")
+    checkpoint = CrawlCheckpoint(path)
+    checkpoint.record(1, URLS[1], products)
+    checkpoint.close()
+
+    checkpoint = CrawlCheckpoint(path)
+    assert checkpoint.completed(URLS) == {}
+    assert checkpoint.last_page() == 0
+    checkpoint.close()
+
+def test_pages_from_another_crawl_are_ignored(tmp_path, products):
+    checkpoint = CrawlCheckpoint(str(tmp_path / "checkpoint.sqlite"))
+    checkpoint.record(1, "http://other/", products)
+    checkpoint.record(2, URLS[2], products)
+    assert list(checkpoint.completed(URLS)) == [2]
+    # a shorter crawl does not see pages beyond its range
+    assert checkpoint.completed({1: URLS[1]}) == {}
+    checkpoint.close()
+
+def test_finished_and_clear(tmp_path):
+    checkpoint = CrawlCheckpoint(str(tmp_path / "checkpoint.sqlite"))
+    for page_num, url in URLS.items():
+        checkpoint.record(page_num, url, PageRecords())
+    assert checkpoint.finished(3)
+    assert checkpoint.finished(3, start_page=2)
+    assert not checkpoint.finished(4, start_page=2)
+    checkpoint.clear()
+    assert not checkpoint.finished(3)
+    checkpoint.close()
@@ -0,0 +1,79 @@
+import json
+import pytest
+import sys
+import os
+
+# directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.config import PipelineConfig
+from main import parse_args, config_from_args
+
+def test_defaults_match_previous_hardcoded_run():
+    config = PipelineConfig()
+    assert (config.start_page, config.pages, config.delay) == (1, 50, 0.5)
+    assert config.destinations == ('csv', 'postgresql', 'sheets')
+    assert config.load_options()['db_port'] == 5432
+
+def test_from_file_with_overrides(tmp_path):
+    path = tmp_path / "pipeline.json"
+    path.write_text(json.dumps({
+        "pages": 200,
+        "destinations": ["csv", "parquet"],
+        "password": "secret",
+        "concurrency": 8,
+    }))
+    config = PipelineConfig.from_file(str(path), concurrency=4)
+    assert config.pages == 200
+    assert config.destinations == ("csv", "parquet")
+    assert config.concurrency == 4
+    assert config.load_options()["password"] == "secret"
+
+def test_unknown_keys_rejected(tmp_path):
+    path = tmp_path / "pipeline.json"
+    path.write_text(json.dumps({"pagez": 10}))
+    with pytest.raises(ValueError, match="pagez"):
+        PipelineConfig.from_file(str(path))
+
+def test_invalid_options_rejected():
+    with pytest.raises(ValueError):
+        PipelineConfig(start_page=10, pages=5)
+    with pytest.raises(ValueError):
+        PipelineConfig(shards=2, streaming=True)
+
+def test_destinations_rejected_before_crawling(tmp_path):
+    path = tmp_path / "pipeline.json"
+    path.write_text(json.dumps({"destinations": "csv"}))
+    with pytest.raises(ValueError, match="string 'csv'"):
+        PipelineConfig.from_file(str(path))
+    with pytest.raises(ValueError, match="Unknown load destinations: pg"):
+        config_from_args(parse_args(["--sinks", "csv,pg"]))
+
+def test_cli_options(tmp_path):
+    path = tmp_path / "pipeline.json"
+    path.write_text(json.dumps({"pages": 30, "user": "etl"}))
+    args = parse_args([
+        "--config", str(path), "--pages", "11-20", "--shards", "2", "--sinks", "csv,parquet",
+        "--incremental", "--every", "3600", "--runs", "2",
+    ])
+    config = config_from_args(args)
+    assert (config.start_page, config.pages) == (11, 20)
+    assert config.shards == 2
+    assert config.destinations == ("csv", "parquet")
+    assert config.incremental and not config.streaming
+    assert config.user == "etl"
+    assert (config.every, config.runs) == (3600, 2)
+
+def test_cli_sink_and_credential_options():
+    config = config_from_args(parse_args([
+        "--chunk-size", "5", "--sheets-diff", "--pg-method", "to_sql", "--timeouts", "sheets=30,postgresql=60",
+        "--db-host", "db", "--db-port", "6543", "--db-user", "etl", "--db-password", "secret", "--db-name", "shop",
+    ]))
+    assert config.chunk_size == 5
+    assert config.sheets_diff is True
+    assert config.pg_method == "to_sql"
+    assert config.timeouts == {"sheets": 30.0, "postgresql": 60.0}
+    assert (config.db_host, config.db_port, config.user, config.password, config.db_name) == ("db", 6543, "etl", "secret", "shop")
+
+def test_cli_single_number_is_last_page():
+    config = config_from_args(parse_args(["--pages", "5"]))
+    assert (config.start_page, config.pages) == (1, 5)
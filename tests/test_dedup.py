@@ -0,0 +1,65 @@
+import pytest
+import pandas as pd
+import sys
+import os
+
+# directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.dedup import FingerprintIndex, fingerprints
+from utils.transform import apply_typed_schema
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "Title": ["T-shirt 1", "T-shirt 2", "T-shirt 1"],
+        "Price": [160000.0, 320000.0, 160000.0],
+        "Rating": [4.5, 3.9, 4.8],
+        "Colors": [3, 5, 3],
+        "Size": ["M", "L", "M"],
+        "Gender": ["Men", "Women", "Men"],
+        "ScrapedAt": ["2025-01-01T00:00:00.000", "2025-01-01T00:00:00.000", "2025-01-02T09:30:00.000"],
+    })
+
+def test_fingerprint_ignores_timestamp_rating_and_formatting(df):
+    fps = fingerprints(df)
+    assert fps[0] == fps[2]
+    assert fps[0] != fps[1]
+    messy = df.assign(Title=["  t-shirt   1 ", "T-shirt 2", "T-SHIRT 1"], Size=[" m", "L", "M "])
+    assert (fingerprints(messy) == fps).all()
+
+def test_fingerprint_is_the_same_for_the_typed_schema(df):
+    typed = apply_typed_schema(df.assign(ScrapedAt=pd.to_datetime(df["ScrapedAt"])))
+    assert (fingerprints(typed) == fingerprints(df)).all()
+
+def test_duplicates_dropped_within_run(tmp_path, df):
+    index = FingerprintIndex(str(tmp_path / "fp.sqlite"))
+    first = index.filter(df)
+    assert first["Title"].tolist() == ["T-shirt 1", "T-shirt 2"]
+    # a later chunk of the same run
+    assert index.filter(df.iloc[[2]]).empty
+    assert index.duplicates_in_run == 2
+    index.close()
+
+def test_duplicates_dropped_across_runs_after_commit(tmp_path, df):
+    path = str(tmp_path / "fp.sqlite")
+    index = FingerprintIndex(path)
+    index.filter(df)
+    index.close()
+
+    # nothing remembered without commit
+    index = FingerprintIndex(path)
+    assert len(index.filter(df)) == 2
+    index.commit()
+    index.close()
+
+    index = FingerprintIndex(path)
+    assert len(index) == 2
+    new = df.assign(Title=["T-shirt 1", "T-shirt 3", "T-shirt 1"])
+    assert index.filter(new)["Title"].tolist() == ["T-shirt 3"]
+    assert index.duplicates_known == 2
+    index.close()
+
+def test_empty_frame_passes_through(tmp_path, df):
+    index = FingerprintIndex(str(tmp_path / "fp.sqlite"))
+    assert index.filter(df.iloc[:0]).empty
+    index.close()
@@ -0,0 +1,93 @@
+import pytest
+import pandas as pd
+import sys
+import os
+
+# directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.history import HistoryStore
+from utils.load import save_to_history, load_data, load_data_stream
+from utils.transform import apply_typed_schema
+
+def run(prices, scraped_at):
+    return pd.DataFrame({
+        "Title": ["T-shirt 1", "T-shirt 2"],
+        "Price": prices,
+        "Rating": [4.5, 3.9],
+        "Colors": [3, 5],
+        "Size": ["M", "L"],
+        "Gender": ["Men", "Women"],
+        "ScrapedAt": [scraped_at, scraped_at],
+    })
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite"))
+    store.append(run([160000.0, 320000.0], "2025-10-01T09:00:00.000"))
+    store.append(run([150000.0, 320000.0], "2025-10-08T09:00:00.000"))
+    yield store
+    store.close()
+
+def test_each_append_is_a_snapshot(store):
+    snapshots = store.snapshots()
+    assert snapshots["snapshot_id"].tolist() == [1, 2]
+    assert snapshots["rows"].tolist() == [2, 2]
+
+def test_price_history_keeps_product_identity(store):
+    history = store.price_history(title="T-shirt 1")
+    assert history["Price"].tolist() == [160000.0, 150000.0]
+    assert history["ScrapedAt"].tolist() == ["2025-10-01T09:00:00.000", "2025-10-08T09:00:00.000"]
+    assert history["product_id"].nunique() == 1
+
+    by_id = store.price_history(product_id=history["product_id"][0], since="2025-10-05")
+    assert by_id["Price"].tolist() == [150000.0]
+
+def test_price_history_needs_a_product(store):
+    with pytest.raises(ValueError):
+        store.price_history()
+
+def test_latest_per_product(store):
+    latest = store.latest()
+    assert latest["Title"].tolist() == ["T-shirt 1", "T-shirt 2"]
+    assert latest["Price"].tolist() == [150000.0, 320000.0]
+    assert latest["snapshot_id"].tolist() == [2, 2]
+
+    before = store.latest(as_of="2025-10-02")
+    assert before["Price"].tolist() == [160000.0, 320000.0]
+
+def test_queries_use_the_indexes(store):
+    plan = store.query("EXPLAIN QUERY PLAN SELECT * FROM products WHERE product_id = 1 ORDER BY ScrapedAt")
+    assert "products_by_product" in " ".join(plan["detail"])
+    plan = store.query("EXPLAIN QUERY PLAN SELECT * FROM products WHERE ScrapedAt >= '2025-10-05'")
+    assert "products_by_time" in " ".join(plan["detail"])
+
+def test_typed_frames_are_stored_as_text_timestamps(tmp_path):
+    path = str(tmp_path / "history.sqlite")
+    typed = apply_typed_schema(run([1.0, 2.0], "2025-10-01T09:00:00.123"))
+    result = save_to_history(typed, path)
+    assert result.ok and result.rows == 2 and result.bytes > 0
+    store = HistoryStore(path)
+    assert store.latest()["ScrapedAt"].tolist() == ["2025-10-01T09:00:00.123"] * 2
+    store.close()
+
+def test_load_data_appends_history_even_when_replacing(tmp_path):
+    path = str(tmp_path / "history.sqlite")
+    for _ in range(2):
+        report = load_data(run([1.0, 2.0], "2025-10-01T09:00:00.000"), destinations=("history",), history_path=path)
+        assert report.ok
+    store = HistoryStore(path)
+    assert len(store.snapshots()) == 2
+    store.close()
+
+def test_streaming_run_is_one_snapshot(tmp_path):
+    path = str(tmp_path / "history.sqlite")
+    chunks = [run([1.0, 2.0], "2025-10-01T09:00:00.000"), run([3.0, 4.0], "2025-10-01T09:00:01.000"),
+              run([5.0, 6.0], "2025-10-01T09:00:02.000")]
+    report = load_data_stream(iter(chunks), destinations=("history",), history_path=path)
+    assert report.ok
+    assert report.rows == {"history": 6}
+    store = HistoryStore(path)
+    snapshots = store.snapshots()
+    assert snapshots["rows"].tolist() == [6]
+    assert store.query("SELECT DISTINCT snapshot_id FROM products")["snapshot_id"].tolist() == snapshots["snapshot_id"].tolist()
+    store.close()
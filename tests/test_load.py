@@ -1,3 +1,5 @@
+import json
+import time
 import pytest
 import pandas as pd
 from unittest.mock import patch, MagicMock
@@ -10,10 +12,36 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from utils.load import (
     save_to_csv,
     save_to_postgresql,
+    save_to_postgresql_copy,
     save_to_google_spreadsheet,
-    load_data
+    save_to_parquet,
+    read_parquet,
+    load_data,
+    load_data_stream,
+    LoadResult,
+    LoadReport,
+    CREDENTIAL_FILE
 )
 
+@pytest.fixture(autouse=True)
+def isolated_sheets(tmp_path):
+    # fresh sheets client cache and snapshot file for every test
+    with patch.dict("utils.load._sheets_services", clear=True), \
+         patch("utils.load.SHEETS_SNAPSHOT", str(tmp_path / "sheets_snapshot.json")):
+        yield
+
+@pytest.fixture
+def typed_df():
+    return pd.DataFrame({
+        "Title": ["Item A"],
+        "Price": [240000.0],
+        "Rating": pd.Series([4.7], dtype="float32"),
+        "Colors": pd.Series([3], dtype="int8"),
+        "Size": pd.Categorical(["M"]),
+        "Gender": pd.Categorical(["Men"]),
+        "ScrapedAt": pd.to_datetime(["2025-05-10 10:00:00.123"]),
+    })
+
 @pytest.fixture
 def sample_df():
     return pd.DataFrame({
@@ -88,7 +116,7 @@ def test_save_to_google_spreadsheet_normal(mock_build, mock_creds, sample_df):
     mock_creds.assert_called_once()
     mock_build.assert_called_once_with("sheets", "v4", credentials=mock_creds.return_value)
     assert mock_values.clear.called
-    assert mock_values.update.called
+    assert mock_values.batchUpdate.called
 
 @patch("utils.load.Credentials.from_service_account_file", side_effect=Exception("Invalid credentials"))
 def test_save_to_google_spreadsheet_exception_prints_error(mock_creds, capsys, sample_df):
@@ -100,14 +128,367 @@ def test_save_to_google_spreadsheet_exception_prints_error(mock_creds, capsys, s
     assert "Invalid credentials" in captured.out
 
 @patch("utils.load.save_to_csv")
-@patch("utils.load.save_to_postgresql")
+@patch("utils.load.save_to_postgresql_copy")
 @patch("utils.load.save_to_google_spreadsheet")
 def test_load_data_calls_all_storage(mock_gsheet, mock_postgres, mock_csv, sample_df):
     load_data(sample_df)
 
-    mock_csv.assert_called_once_with(sample_df, 'fashion_data.csv')
-    mock_postgres.assert_called_once_with(sample_df, 'fashion_db', 'wafanur', 'wafanur444', table_name='products')
-    mock_gsheet.assert_called_once_with(sample_df, '1JAnu0DVGOaoWZSxZ-q1s6M-2KtIAH16JT6_yzoZNAQs', 'Sheet1!A1')
+    mock_csv.assert_called_once_with(sample_df, 'fashion_data.csv', if_exists='replace')
+    mock_postgres.assert_called_once_with(sample_df, 'fashion_db', 'wafanur', 'wafanur444', 'localhost', 5432, table_name='products', if_exists='replace')
+    mock_gsheet.assert_called_once_with(sample_df, '1JAnu0DVGOaoWZSxZ-q1s6M-2KtIAH16JT6_yzoZNAQs', 'Sheet1!A1', CREDENTIAL_FILE, if_exists='replace', diff=False)
+
+@patch("utils.load.save_to_csv")
+@patch("utils.load.save_to_postgresql")
+@patch("utils.load.save_to_google_spreadsheet")
+def test_load_data_to_sql_method(mock_gsheet, mock_postgres, mock_csv, sample_df):
+    load_data(sample_df, pg_method='to_sql')
+    mock_postgres.assert_called_once_with(sample_df, 'fashion_db', 'wafanur', 'wafanur444', 'localhost', 5432, table_name='products', if_exists='replace')
+
+@patch("utils.load.save_to_csv")
+@patch("utils.load.save_to_parquet")
+@patch("utils.load.save_to_postgresql_copy")
+@patch("utils.load.save_to_google_spreadsheet")
+def test_load_data_selected_destinations(mock_gsheet, mock_postgres, mock_parquet, mock_csv, sample_df):
+    load_data(sample_df, destinations=('parquet',), parquet_path='out', if_exists='append')
+    mock_parquet.assert_called_once_with(sample_df, 'out', if_exists='append')
+    assert not mock_csv.called and not mock_postgres.called and not mock_gsheet.called
+
+def test_save_to_parquet_partitions_and_appends(tmp_path, typed_df):
+    path = str(tmp_path / "parquet")
+    later = typed_df.assign(ScrapedAt=pd.to_datetime(["2025-05-11 08:00:00"]))
+    save_to_parquet(typed_df, path)
+    save_to_parquet(later, path, if_exists='append')
+
+    assert sorted(os.listdir(path)) == ["scrape_date=2025-05-10", "scrape_date=2025-05-11"]
+    loaded = read_parquet(path).sort_values("ScrapedAt", ignore_index=True)
+    assert len(loaded) == 2
+    assert loaded["Rating"].dtype == "float32"
+    assert loaded["Colors"].dtype == "int8"
+    assert pd.api.types.is_datetime64_any_dtype(loaded["ScrapedAt"])
+
+    save_to_parquet(typed_df, path, compression="snappy")
+    assert len(read_parquet(path)) == 1
+
+def test_save_to_parquet_string_schema_unpartitioned(tmp_path, sample_df):
+    path = str(tmp_path / "parquet")
+    save_to_parquet(sample_df, path, partition_by_date=False, row_group_size=10)
+    loaded = read_parquet(path)
+    assert loaded.to_dict("records") == sample_df.to_dict("records")
+
+class FakeSheets:
+    """Sheets values() stand-in keeping a grid and counting requests and payload bytes."""
+
+    def __init__(self):
+        self.grid = {}
+        self.requests = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def _record(self, kind, body=None):
+        self.requests.append((kind, len(json.dumps(body)) if body is not None else 0))
+        return MagicMock()
+
+    @staticmethod
+    def _rows(a1):
+        cells = a1.split("!")[-1].split(":")
+        start = int("".join(c for c in cells[0] if c.isdigit()))
+        end_digits = "".join(c for c in cells[1] if c.isdigit()) if len(cells) > 1 else str(start)
+        return start, int(end_digits) if end_digits else None
+
+    def clear(self, spreadsheetId, range):
+        start, end = self._rows(range)
+        for row in list(self.grid):
+            if row >= start and (end is None or row <= end):
+                del self.grid[row]
+        return self._record("clear")
+
+    def batchUpdate(self, spreadsheetId, body):
+        for item in body["data"]:
+            start, _ = self._rows(item["range"])
+            for offset, values in enumerate(item["values"]):
+                self.grid[start + offset] = values
+        return self._record("batchUpdate", body)
+
+    def append(self, spreadsheetId, range, valueInputOption, insertDataOption, body):
+        start = max(self.grid, default=0) + 1
+        for offset, values in enumerate(body["values"]):
+            self.grid[start + offset] = values
+        return self._record("append", body)
+
+    def table(self):
+        return [self.grid[row] for row in sorted(self.grid)]
+
+@pytest.fixture
+def fake_sheets():
+    sheets = FakeSheets()
+    with patch("utils.load.get_sheets_service", return_value=sheets):
+        yield sheets
+
+def _catalogue(rows):
+    return pd.DataFrame({
+        "Title": [f"Item {i}" for i in range(rows)],
+        "Price": [float(i) for i in range(rows)],
+        "Size": ["M"] * rows,
+    })
+
+def test_sheets_full_write_is_chunked(fake_sheets):
+    df = _catalogue(25)
+    result = save_to_google_spreadsheet(df, spreadsheet_id="id", chunk_rows=10)
+
+    kinds = [kind for kind, _ in fake_sheets.requests]
+    assert kinds == ["clear", "batchUpdate", "batchUpdate", "batchUpdate"]
+    assert fake_sheets.table() == [df.columns.tolist()] + df.values.tolist()
+    assert result.rows == 25
+    assert result.bytes == sum(size for _, size in fake_sheets.requests)
+
+def test_sheets_diff_only_rewrites_changed_rows(fake_sheets):
+    df = _catalogue(100)
+    save_to_google_spreadsheet(df, spreadsheet_id="id", diff=True, chunk_rows=50)
+    full_bytes = sum(size for _, size in fake_sheets.requests)
+    fake_sheets.requests.clear()
+
+    changed = df.copy()
+    changed.loc[[10, 11, 70], "Price"] = 999.0
+    result = save_to_google_spreadsheet(changed, spreadsheet_id="id", diff=True, chunk_rows=50)
+
+    assert [kind for kind, _ in fake_sheets.requests] == ["batchUpdate"]
+    assert result.rows == 3
+    assert result.bytes < full_bytes / 10
+    assert fake_sheets.table() == [changed.columns.tolist()] + changed.values.tolist()
+
+def test_sheets_diff_clears_removed_rows(fake_sheets):
+    save_to_google_spreadsheet(_catalogue(10), spreadsheet_id="id", diff=True)
+    fake_sheets.requests.clear()
+
+    shorter = _catalogue(6)
+    result = save_to_google_spreadsheet(shorter, spreadsheet_id="id", diff=True)
+
+    assert [kind for kind, _ in fake_sheets.requests] == ["clear"]
+    assert result.rows == 0
+    assert fake_sheets.table() == [shorter.columns.tolist()] + shorter.values.tolist()
+
+def test_sheets_append_is_chunked_and_extends_snapshot(fake_sheets):
+    df = _catalogue(5)
+    save_to_google_spreadsheet(df, spreadsheet_id="id")
+    save_to_google_spreadsheet(_catalogue(12).iloc[5:], spreadsheet_id="id", if_exists="append", chunk_rows=4)
+    assert [kind for kind, _ in fake_sheets.requests][-2:] == ["append", "append"]
+    fake_sheets.requests.clear()
+
+    save_to_google_spreadsheet(_catalogue(12), spreadsheet_id="id", diff=True)
+    assert fake_sheets.requests == []
+    assert len(fake_sheets.table()) == 13
+
+@patch("utils.load.Credentials.from_service_account_file")
+@patch("utils.load.build")
+def test_sheets_service_is_cached(mock_build, mock_creds, sample_df):
+    save_to_google_spreadsheet(sample_df, spreadsheet_id="id", credential_file="fake.json")
+    save_to_google_spreadsheet(sample_df, spreadsheet_id="id", credential_file="fake.json")
+    mock_build.assert_called_once()
+
+class FakeCursor:
+    """psycopg2 cursor stand-in recording statements and COPY payloads."""
+
+    def __init__(self):
+        self.statements = []
+        self.copied = b""
+        self.rowcount = -1
+        self.inserted = 0
+
+    def execute(self, sql):
+        self.statements.append(sql)
+        if sql.startswith("INSERT"):
+            self.rowcount = self.inserted
+
+    def copy_expert(self, sql, file, size=8192):
+        self.statements.append(sql)
+        while True:
+            data = file.read(size)
+            if not data:
+                break
+            self.copied += data
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def fake_pg():
+    cursor = FakeCursor()
+    engine = MagicMock()
+    conn = engine.begin.return_value.__enter__.return_value
+    conn.connection.cursor.return_value = cursor
+    with patch("utils.load.get_engine", return_value=engine):
+        yield engine, cursor
+
+def test_save_to_postgresql_copy_upserts_in_one_transaction(fake_pg, sample_df):
+    engine, cursor = fake_pg
+    # the same key twice, DISTINCT ON keeps one row
+    df = pd.concat([sample_df, sample_df], ignore_index=True)
+    cursor.inserted = 1
+    result = save_to_postgresql_copy(df, table_name="products", if_exists="append")
+
+    engine.begin.assert_called_once()
+    statements = cursor.statements
+    assert statements[0].startswith('CREATE TABLE IF NOT EXISTS "products"')
+    assert 'UNIQUE INDEX' in statements[1]
+    assert statements[2].startswith('CREATE TEMP TABLE "products_staging"')
+    assert statements[3].startswith('COPY "products_staging"')
+    assert not any(sql.startswith("TRUNCATE") for sql in statements)
+    upsert = statements[-1]
+    assert 'ON CONFLICT ("Title", "Size", "Gender", "Colors") DO UPDATE SET "Price" = EXCLUDED."Price"' in upsert
+    assert 'DISTINCT ON ("Title", "Size", "Gender", "Colors")' in upsert
+    assert cursor.copied.decode("utf-8") == df.to_csv(index=False, header=False)
+    assert result.rows == 1
+
+def test_save_to_postgresql_copy_replace_truncates(fake_pg, sample_df):
+    _, cursor = fake_pg
+    save_to_postgresql_copy(sample_df, if_exists="replace")
+    # before the unique index, so old duplicate rows cannot make it fail
+    assert cursor.statements[1] == 'TRUNCATE "products"'
+    assert 'UNIQUE INDEX' in cursor.statements[2]
+    assert cursor.statements[-1].startswith('INSERT INTO "products"')
+
+def test_save_to_postgresql_copy_streams_in_chunks(fake_pg, typed_df):
+    _, cursor = fake_pg
+    df = pd.concat([typed_df] * 25, ignore_index=True)
+    with patch("utils.load.COPY_CHUNK_ROWS", 4):
+        save_to_postgresql_copy(df)
+    lines = cursor.copied.decode("utf-8").splitlines()
+    assert len(lines) == 25
+    assert lines[0] == "Item A,240000.0,4.7,3,M,Men,2025-05-10T10:00:00.123"
+    create = cursor.statements[0]
+    assert '"Colors" SMALLINT' in create and '"Rating" REAL' in create and '"ScrapedAt" TIMESTAMP' in create
+
+@patch("utils.load.get_engine", side_effect=Exception("Connection failed"))
+def test_save_to_postgresql_copy_exception_prints_error(mock_engine, capsys, sample_df):
+    save_to_postgresql_copy(sample_df)
+    assert "Connection failed" in capsys.readouterr().out
+
+def test_save_to_csv_returns_result(tmp_path, sample_df):
+    file = tmp_path / "test.csv"
+    result = save_to_csv(sample_df, filename=str(file))
+    assert result.ok and result.rows == 1
+    assert result.bytes == file.stat().st_size
+
+@patch("utils.load.save_to_csv", side_effect=lambda *a, **k: time.sleep(0.3))
+@patch("utils.load.save_to_postgresql_copy", side_effect=lambda *a, **k: time.sleep(0.3))
+@patch("utils.load.save_to_google_spreadsheet", side_effect=lambda *a, **k: time.sleep(0.3))
+def test_load_data_runs_destinations_in_parallel(mock_gsheet, mock_postgres, mock_csv, sample_df):
+    start = time.perf_counter()
+    report = load_data(sample_df)
+    assert time.perf_counter() - start < 0.6
+    assert report.ok
+    assert report.rows == {'csv': 1, 'postgresql': 1, 'sheets': 1}
+    assert all(result.duration >= 0.3 for result in report.results)
+
+@patch("utils.load.save_to_csv", return_value=LoadResult('csv', rows=1, bytes=42))
+@patch("utils.load.save_to_postgresql_copy", side_effect=RuntimeError("boom"))
+@patch("utils.load.save_to_google_spreadsheet", side_effect=lambda *a, **k: time.sleep(1))
+def test_load_data_isolates_failures_and_timeouts(mock_gsheet, mock_postgres, mock_csv, sample_df):
+    start = time.perf_counter()
+    report = load_data(sample_df, timeouts={'sheets': 0.1})
+    assert time.perf_counter() - start < 0.5
+
+    results = {result.destination: result for result in report.results}
+    assert results['csv'].ok and results['csv'].bytes == 42
+    assert results['postgresql'].error == "boom"
+    assert "timed out" in results['sheets'].error
+    assert not report.ok
+    assert [result.destination for result in report.failed] == ['postgresql', 'sheets']
+    assert "FAILED (boom)" in report.summary()
+
+@patch("utils.load.load_data")
+def test_load_data_stream_replaces_then_appends(mock_load, sample_df):
+    mock_load.return_value = LoadReport([LoadResult("csv", rows=1)])
+    chunks = [pd.DataFrame(columns=sample_df.columns), sample_df, sample_df]
+    report = load_data_stream(iter(chunks), filename_csv="out.csv")
+
+    assert report.ok
+    assert report.rows == {"csv": 2}
+    modes = [c.kwargs["if_exists"] for c in mock_load.call_args_list]
+    assert modes == ["replace", "append"]
+    assert all(c.kwargs["filename_csv"] == "out.csv" for c in mock_load.call_args_list)
+
+@patch("utils.load.load_data")
+def test_load_data_stream_reports_failed_chunks(mock_load, sample_df):
+    mock_load.side_effect = [
+        LoadReport([LoadResult("csv", rows=1), LoadResult("parquet", rows=1)]),
+        LoadReport([LoadResult("csv", error="disk full"), LoadResult("parquet", rows=1)]),
+    ]
+    report = load_data_stream(iter([sample_df, sample_df]))
+
+    assert not report.ok
+    assert report.rows == {"csv": 1, "parquet": 2}
+    assert [result.destination for result in report.failed] == ["csv"]
+
+@patch("utils.load.load_data")
+def test_load_data_stream_skips_timed_out_destination(mock_load, sample_df):
+    mock_load.side_effect = [
+        LoadReport([LoadResult("csv", rows=1), LoadResult("sheets", error="timed out after 1s", timed_out=True)]),
+        LoadReport([LoadResult("csv", rows=1)]),
+    ]
+    report = load_data_stream(iter([sample_df, sample_df]), destinations=("csv", "sheets"))
+
+    # the late sheets write is never raced by the next chunk
+    assert [c.kwargs["destinations"] for c in mock_load.call_args_list] == [("csv", "sheets"), ("csv",)]
+    assert report.rows == {"csv": 2, "sheets": 0}
+    assert [result.destination for result in report.failed] == ["sheets"]
+
+def test_load_data_unknown_destination(sample_df):
+    with pytest.raises(ValueError, match="Unknown load destinations: pg"):
+        load_data(sample_df, destinations=("csv", "pg"))
+
+def test_save_to_csv_typed_schema(tmp_path, typed_df):
+    file = tmp_path / "typed.csv"
+    save_to_csv(typed_df, filename=str(file))
+    row = pd.read_csv(file).iloc[0]
+    assert row["Rating"] == 4.7
+    assert row["Size"] == "M"
+    assert row["ScrapedAt"] == "2025-05-10T10:00:00.123"
+
+@patch("utils.load.create_engine")
+def test_save_to_postgresql_typed_schema_native_types(mock_create_engine, typed_df):
+    typed_df.to_sql = MagicMock()
+    save_to_postgresql(typed_df, db_name="db_test", user="usr", password="pwd")
+
+    dtypes = typed_df.to_sql.call_args.kwargs["dtype"]
+    assert type(dtypes["Rating"]).__name__ == "REAL"
+    assert type(dtypes["Colors"]).__name__ == "SmallInteger"
+    assert dtypes["Size"].length == 1
+    assert type(dtypes["ScrapedAt"]).__name__ == "TIMESTAMP"
+    assert "Title" not in dtypes
+
+@patch("utils.load.Credentials.from_service_account_file")
+@patch("utils.load.build")
+def test_save_to_google_spreadsheet_typed_schema_serializable(mock_build, mock_creds, typed_df):
+    mock_values = mock_build.return_value.spreadsheets.return_value.values.return_value
+    save_to_google_spreadsheet(typed_df, spreadsheet_id="fake_id", credential_file="fake.json")
+
+    body = mock_values.batchUpdate.call_args.kwargs["body"]
+    assert body["data"][0]["values"][1] == ["Item A", 240000.0, 4.7, 3, "M", "Men", "2025-05-10T10:00:00.123"]
+    json.dumps(body)
+
+def test_save_to_csv_append(tmp_path, sample_df):
+    file = tmp_path / "test.csv"
+    save_to_csv(sample_df, filename=str(file), if_exists='append')
+    save_to_csv(sample_df, filename=str(file), if_exists='append')
+    df_loaded = pd.read_csv(file)
+    assert len(df_loaded) == 2
+    assert list(df_loaded.columns) == list(sample_df.columns)
+
+@patch("utils.load.Credentials.from_service_account_file")
+@patch("utils.load.build")
+def test_save_to_google_spreadsheet_append(mock_build, mock_creds, sample_df):
+    mock_values = mock_build.return_value.spreadsheets.return_value.values.return_value
+
+    save_to_google_spreadsheet(sample_df, spreadsheet_id="fake_id", credential_file="fake.json", if_exists='append')
+
+    assert not mock_values.clear.called
+    body = mock_values.append.call_args.kwargs["body"]
+    assert body["values"] == sample_df.values.tolist()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,107 @@
+import pytest
+import json
+import sys
+import os
+
+# directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.metrics import RunMetrics, delta, instrumented_run, metrics, peak_rss
+from utils.extract import parse_page, parse_pages
+from utils.transform import clean_and_transform
+from utils.load import LoadReport, LoadResult
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+def test_counters_and_stages():
+    run = RunMetrics()
+    run.incr('pages')
+    run.incr('pages', 2)
+    with run.stage('parse'):
+        pass
+    timers, counters = run.snapshot()
+    assert counters == {'pages': 3}
+    assert timers['parse'] >= 0
+
+def test_delta_and_merge():
+    run = RunMetrics()
+    run.incr('cards', 5)
+    before = run.snapshot()
+    run.incr('cards', 3)
+    run.incr('errors')
+    run.add_time('parse', 0.5)
+    timers, counters = delta(before, run.snapshot())
+    assert counters == {'cards': 3, 'errors': 1}
+    assert timers == {'parse': 0.5}
+
+    other = RunMetrics()
+    other.merge(timers, counters)
+    other.merge(timers, counters)
+    assert other.snapshot() == ({'parse': 1.0}, {'cards': 6, 'errors': 2})
+
+def test_load_results_accumulate_across_chunks():
+    run = RunMetrics()
+    for _ in range(2):
+        run.record_load(LoadReport([LoadResult('csv', rows=10, bytes=100, duration=0.5)]))
+    run.record_load(LoadReport([LoadResult('csv', error='disk full')]))
+    assert run.destinations['csv'] == {'rows': 20, 'bytes': 200, 'duration': 1.0, 'error': 'disk full'}
+
+def test_parse_counts_cards():
+    products = parse_page(read_fixture("page1.html"), 1)
+    _, counters = metrics.snapshot()
+    assert counters['pages_parsed'] == 1
+    assert counters['cards'] >= len(products)
+    assert 'parse' in metrics.snapshot()[0]
+
+def test_worker_metrics_are_merged():
+    pages = [(n, read_fixture("page1.html")) for n in range(1, 5)]
+    list(parse_pages(pages, workers=2, chunksize=2))
+    _, counters = metrics.snapshot()
+    assert counters['pages_parsed'] == 4
+
+def test_transform_counts_rejections():
+    rows = [
+        {"Title": "Shirt", "Price": "$10.00", "Rating": "4.5 / 5", "Colors": "3 Colors", "Size": "Size: M", "Gender": "Gender: Men", "ScrapedAt": "2025-01-01T00:00:00"},
+        {"Title": "Shirt", "Price": "$10.00", "Rating": "4.5 / 5", "Colors": "3 Colors", "Size": "Size: M", "Gender": "Gender: Men", "ScrapedAt": "2025-01-01T00:00:00"},
+        {"Title": "Unknown Product", "Price": "$10.00", "Rating": "4.5 / 5", "Colors": "3 Colors", "Size": "Size: M", "Gender": "Gender: Men", "ScrapedAt": "2025-01-01T00:00:00"},
+        {"Title": "Pants", "Price": "Price Unavailable", "Rating": "Invalid Rating", "Colors": "3 Colors", "Size": "Size: M", "Gender": "Gender: Men", "ScrapedAt": "2025-01-01T00:00:00"},
+    ]
+    df = clean_and_transform(rows)
+    _, counters = metrics.snapshot()
+    assert len(df) == 1
+    assert counters['rows_in'] == 4
+    assert counters['rows_out'] == 1
+    assert counters['rejected.title_unknown'] == 1
+    assert counters['rejected.price_invalid'] == 1
+    assert counters['rejected.rating_invalid'] == 1
+    assert counters['rejected.duplicates'] == 1
+
+def test_instrumented_run_writes_report(tmp_path):
+    report_path = str(tmp_path / "report.json")
+    profile_path = str(tmp_path / "run.prof")
+    with instrumented_run(report_path, profile_path, trace_memory=True) as run:
+        run.incr('pages_fetched', 2)
+        with run.stage('transform'):
+            [bytes(1024) for _ in range(100)]
+
+    with open(report_path) as f:
+        report = json.load(f)
+    assert report['counters'] == {'pages_fetched': 2}
+    assert 'transform' in report['timers']
+    assert report['peak_rss_bytes'] > 0
+    assert report['tracemalloc']['peak_bytes'] > 0
+    assert report['tracemalloc']['top']
+    assert os.path.getsize(profile_path) > 0
+
+def test_peak_rss_without_resource_module(monkeypatch):
+    monkeypatch.setattr("utils.metrics.resource", None)
+    assert peak_rss() is None
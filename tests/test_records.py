@@ -0,0 +1,57 @@
+import pytest
+import pickle
+import sys
+import os
+from datetime import datetime
+
+import pandas as pd
+
+# directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.records import FIELDS, PageRecords, records_to_frame
+
+FIRST = datetime(2025, 1, 1, 10, 0, 0, 123000)
+SECOND = datetime(2025, 1, 1, 10, 0, 5)
+
+def page(scraped_at, *titles):
+    records = PageRecords(scraped_at)
+    for title in titles:
+        records.append((title, "$10.00", "⭐ 4.5", "3 Colors", "M", "Men"))
+    return records
+
+def test_products_share_the_page_timestamp():
+    records = page(FIRST, "A", "B")
+    assert len(records) == 2
+    assert [product["Title"] for product in records] == ["A", "B"]
+    assert {product["ScrapedAt"] for product in records} == {FIRST}
+    assert list(next(iter(records))) == list(FIELDS) + ["ScrapedAt"]
+
+def test_no_per_instance_dict():
+    with pytest.raises(AttributeError):
+        page(FIRST).__dict__
+
+def test_filter_keeps_matching_rows():
+    kept = page(FIRST, "A", "B", "C").filter(lambda values: values[0] != "B")
+    assert kept.Title == ["A", "C"]
+    assert kept.scraped_at == FIRST
+
+def test_dict_round_trip_and_pickle():
+    records = page(FIRST, "A")
+    restored = PageRecords.from_dict(records.as_dict())
+    assert list(restored) == list(records)
+    assert list(pickle.loads(pickle.dumps(records))) == list(records)
+
+def test_records_to_frame_repeats_page_timestamps():
+    frame = records_to_frame([page(FIRST, "A", "B"), page(SECOND), page(SECOND, "C")])
+    assert list(frame.columns) == list(FIELDS) + ["ScrapedAt"]
+    assert frame["Title"].tolist() == ["A", "B", "C"]
+    assert frame["ScrapedAt"].tolist() == [pd.Timestamp(FIRST), pd.Timestamp(FIRST), pd.Timestamp(SECOND)]
+    assert pd.api.types.is_datetime64_any_dtype(frame["ScrapedAt"])
+
+def test_records_to_frame_empty():
+    frame = records_to_frame([])
+    assert frame.empty
+    assert list(frame.columns) == list(FIELDS) + ["ScrapedAt"]
+
+if __name__ == "__main__":
+    pytest.main(['-v', __file__])
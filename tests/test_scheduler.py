@@ -0,0 +1,56 @@
+import pytest
+import sys
+import os
+
+# directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.scheduler import run_every
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def test_fixed_rate_runs():
+    clock = FakeClock()
+    starts = []
+
+    def job():
+        starts.append(clock.now)
+        clock.now += 2
+
+    assert run_every(job, 10, runs=3, clock=clock, sleep=clock.sleep) == 3
+    assert starts == [0, 10, 20]
+    assert clock.sleeps == [8, 8]
+
+def test_overrun_starts_next_run_at_once():
+    clock = FakeClock()
+    starts = []
+
+    def job():
+        starts.append(clock.now)
+        clock.now += 15
+
+    run_every(job, 10, runs=2, clock=clock, sleep=clock.sleep)
+    assert starts == [0, 15]
+    assert clock.sleeps == [0]
+
+def test_failed_run_does_not_stop_schedule(capsys):
+    clock = FakeClock()
+    calls = []
+
+    def job():
+        calls.append(clock.now)
+        if len(calls) == 1:
+            raise RuntimeError("site down")
+
+    run_every(job, 5, runs=2, clock=clock, sleep=clock.sleep)
+    assert len(calls) == 2
+    assert "site down" in capsys.readouterr().out
@@ -0,0 +1,60 @@
+import pytest
+import sys
+import os
+
+# directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.archive import ArchiveWriter
+from utils.config import PipelineConfig
+from utils.extract import page_url
+from utils.metrics import metrics
+from utils.shard import shard_ranges, shard_rate, run_shards, merge_shards
+
+def test_shard_ranges_cover_every_page_once():
+    assert shard_ranges(1, 50, 4) == [(1, 13), (14, 26), (27, 38), (39, 50)]
+    assert shard_ranges(10, 12, 8) == [(10, 10), (11, 11), (12, 12)]
+    assert shard_ranges(1, 5, 1) == [(1, 5)]
+
+def test_shards_split_the_rate_limit():
+    assert shard_rate(PipelineConfig(rate_limit=8, shards=4)) == 2
+    # without a rate limit the delay sets it
+    assert shard_rate(PipelineConfig(delay=0.5, shards=4)) == 0.5
+    assert shard_rate(PipelineConfig(delay=0, shards=4)) is None
+
+def card(title, price=10):
+    return f"""<div class='collection-card'>
+        <div class='product-details'><h3 class='product-title'>{title}</h3></div>
+        <div class='price-container'>${price}.00</div>
+        <p>Rating: ⭐ 4.5 / 5</p><p>3 Colors</p><p>Size: M</p><p>Gender: Men</p>
+    </div>"""
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    # shards keep their cache and checkpoints under .cache of the working directory
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "archive")
+    with ArchiveWriter(path) as writer:
+        for page_num in range(1, 6):
+            # pages replayed within the same millisecond share a timestamp, the price keeps rows distinct
+            body = card(f"Item {page_num}") + card("Shared", page_num) + card("Unknown Product")
+            writer.add(page_url(page_num), body.encode())
+    return path
+
+def test_sharded_crawl_merges_in_page_order(archive):
+    metrics.reset()
+    config = PipelineConfig(pages=5, shards=2, replay=archive, delay=0, parser='bs4')
+    results = run_shards(config)
+
+    assert [(r.start_page, r.pages) for r in results] == [(1, 3), (4, 5)]
+    assert [r.products for r in results] == [9, 6]
+    assert sum(len(r.quarantine) for r in results) == 5
+
+    data = merge_shards(results)
+    titles = data["Title"].tolist()
+    assert [title for title in titles if title != "Shared"] == [f"Item {n}" for n in range(1, 6)]
+    assert data.index.tolist() == list(range(10))
+    # counters from the worker processes are merged into the parent
+    _, counters = metrics.snapshot()
+    assert counters["pages_fetched"] == 5
+    assert counters["rejected.title_unknown"] == 5
+    assert os.path.exists(".cache/checkpoint-1-3.sqlite")
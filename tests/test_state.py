@@ -0,0 +1,72 @@
+import pytest
+import sys
+import os
+from datetime import datetime
+
+# directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.state import IncrementalState, PRODUCT_FIELDS, product_hash, values_hash
+
+@pytest.fixture
+def product():
+    return {
+        "Title": "T-shirt 1",
+        "Price": "$10.00",
+        "Rating": "⭐ 4.5",
+        "Colors": "3",
+        "Size": "M",
+        "Gender": "Men",
+        "ScrapedAt": datetime.now(),
+    }
+
+def test_product_hash_ignores_timestamp(product):
+    later = dict(product, ScrapedAt=datetime(2030, 1, 1))
+    assert product_hash(product) == product_hash(later)
+    assert product_hash(product) != product_hash(dict(product, Price="$11.00"))
+
+def test_unchanged_page_skipped_after_commit(tmp_path):
+    state = IncrementalState(str(tmp_path / "state.sqlite"))
+    assert state.page_changed("http://a/", b"v1")
+    state.commit()
+    assert not state.page_changed("http://a/", b"v1")
+    assert state.page_changed("http://a/", b"v2")
+    assert state.pages_skipped == 1
+    state.close()
+
+def test_nothing_remembered_without_commit(tmp_path, product):
+    path = str(tmp_path / "state.sqlite")
+    state = IncrementalState(path)
+    assert state.page_changed("http://a/", b"v1")
+    assert state.product_changed(product)
+    state.close()
+
+    state = IncrementalState(path)
+    assert state.page_changed("http://a/", b"v1")
+    assert state.product_changed(product)
+    state.close()
+
+def test_only_new_or_changed_products(tmp_path, product):
+    path = str(tmp_path / "state.sqlite")
+    state = IncrementalState(path)
+    assert state.product_changed(product)
+    assert not state.product_changed(dict(product))
+    state.commit()
+    state.close()
+
+    state = IncrementalState(path)
+    assert not state.product_changed(product)
+    assert state.product_changed(dict(product, Rating="⭐ 4.8"))
+    assert state.products_skipped == 1
+    state.close()
+
+def test_values_hash_matches_product_hash(tmp_path, product):
+    values = tuple(product[field] for field in PRODUCT_FIELDS)
+    assert values_hash(values) == product_hash(product)
+    state = IncrementalState(str(tmp_path / "state.sqlite"))
+    assert state.product_changed(product)
+    # a page record of the same product is recognised without building a dict
+    assert not state.values_changed(values)
+    state.close()
+
+if __name__ == "__main__":
+    pytest.main(['-v', __file__])
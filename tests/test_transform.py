@@ -5,7 +5,7 @@ import os
 
 # directory
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils.transform import clean_and_transform
+from utils.transform import clean_and_transform, transform_chunks, apply_typed_schema
 
 def test_valid_transformation():
     data = {
@@ -56,5 +56,102 @@ def test_invalid_price():
     transformed = clean_and_transform(df)
     assert transformed.empty
 
+def test_mixed_and_missing_values():
+    row = {"Title": "A", "Price": "$1", "Rating": "⭐ 4", "Colors": "3", "Size": "Size: M", "Gender": "Gender: Men", "ScrapedAt": "2025-10-18 09:00:00.123456"}
+    df = pd.DataFrame([
+        row,
+        dict(row, Title="B", Colors=None),
+        dict(row, Title="C", Size=None),
+        dict(row, Title="Unknown Product"),
+        dict(row, Title="D", Price=12.5),
+        row,
+    ])
+    transformed = clean_and_transform(df)
+
+    assert transformed["Title"].tolist() == ["A", "C", "D"]
+    assert transformed["Price"].tolist() == [16000.0, 16000.0, 200000.0]
+    assert transformed["Colors"].dtype == int
+    assert transformed["Size"].tolist() == ["M", "Unknown", "M"]
+    assert transformed["Gender"].tolist() == ["Men", "Men", "Men"]
+    assert transformed["ScrapedAt"].tolist() == ["2025-10-18T09:00:00.123"] * 3
+    assert transformed.index.tolist() == [0, 2, 4]
+
+def test_input_not_modified():
+    df = pd.DataFrame({
+        " Title ": ["A"],
+        "Price": ["$5.00"],
+        "Rating": ["⭐ 3"],
+        "Colors": ["3 Colors"],
+        "Size": ["S"],
+        "Gender": ["Male"],
+        "ScrapedAt": ["2025-10-18 09:00:00"]
+    })
+    before = df.copy()
+    transformed = clean_and_transform(df)
+    assert list(transformed.columns)[0] == "Title"
+    pd.testing.assert_frame_equal(df, before)
+
+def test_typed_schema():
+    data = {
+        "Title": ["A", "B", "C"],
+        "Price": ["$5.00", "$10.00", "$10.00"],
+        "Rating": ["⭐ 3", "⭐ 4.7", "⭐ 4.7"],
+        "Colors": ["3 Colors", "5 Colors", "5 Colors"],
+        "Size": ["S", "M", "M"],
+        "Gender": ["Male", "Female", "Female"],
+        "ScrapedAt": ["2025-10-18 09:00:00.123456", "2025-10-18 10:00:00", "2025-10-18 10:00:00"]
+    }
+    typed = clean_and_transform(pd.DataFrame(data), typed=True)
+    default = clean_and_transform(pd.DataFrame(data))
+
+    assert typed["Rating"].dtype == "float32"
+    assert typed["Colors"].dtype == "int8"
+    assert isinstance(typed["Size"].dtype, pd.CategoricalDtype)
+    assert isinstance(typed["Gender"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(typed["ScrapedAt"])
+    assert typed["ScrapedAt"].iloc[0] == pd.Timestamp("2025-10-18 09:00:00.123")
+    assert typed.index.tolist() == default.index.tolist()
+    assert typed["Price"].tolist() == default["Price"].tolist()
+
+def test_apply_typed_schema_reports_memory(capsys):
+    df = clean_and_transform(pd.DataFrame({
+        "Title": ["A"] * 50,
+        "Price": ["$5.00"] * 50,
+        "Rating": ["⭐ 3"] * 50,
+        "Colors": ["3 Colors"] * 50,
+        "Size": ["S"] * 50,
+        "Gender": ["Male"] * 50,
+        "ScrapedAt": [f"2025-10-18 09:00:{i:02d}" for i in range(50)]
+    }))
+    typed = apply_typed_schema(df)
+    assert "Typed schema memory" in capsys.readouterr().out
+    assert typed.memory_usage(deep=True).sum() < df.memory_usage(deep=True).sum()
+    assert typed["ScrapedAt"].iloc[1] == pd.Timestamp("2025-10-18 09:00:01")
+
+def test_transform_chunks_fixed_size():
+    row = {
+        "Title": "A",
+        "Price": "$5.00",
+        "Rating": "⭐ 3",
+        "Colors": "3 Colors",
+        "Size": "S",
+        "Gender": "Male",
+    }
+    batches = [
+        [dict(row, ScrapedAt=f"2025-10-18 09:00:{i:02d}") for i in range(start, start + 4)]
+        for start in (0, 4, 8)
+    ]
+    chunks = list(transform_chunks(iter(batches), chunk_size=5))
+    assert [len(chunk) for chunk in chunks] == [5, 5, 2]
+    assert chunks[0]["Price"].tolist() == [80000.0] * 5
+
+def test_transform_chunks_lazy():
+    def batches():
+        yield [{"Title": "A", "Price": "$1", "Rating": "⭐ 4", "Colors": "1", "Size": "S", "Gender": "Men", "ScrapedAt": "2025-10-18 09:00:00"}]
+        raise AssertionError("second page must not be pulled before the first chunk is used")
+
+    chunks = transform_chunks(batches(), chunk_size=1)
+    assert len(next(chunks)) == 1
+
 if __name__ == "__main__":
     pytest.main(['-v', __file__])
\ No newline at end of file
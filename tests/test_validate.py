@@ -0,0 +1,86 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.validate import Quarantine, validate, reasons, RULES
+from utils.transform import clean_and_transform, transform_chunks
+
+@pytest.fixture
+def rows():
+    row = {"Title": "A", "Price": "$1", "Rating": "⭐ 4", "Colors": "3", "Size": "M", "Gender": "Men", "ScrapedAt": "2025-10-18 09:00:00"}
+    return [
+        row,
+        dict(row, Title=None),
+        dict(row, Title="Unknown Product", Price="Price Unavailable"),
+        dict(row, Title="B", Rating=None, Colors=None),
+        dict(row, Title="C", ScrapedAt="not a date"),
+        dict(row, Title="D", Size=None, Gender=None),
+    ]
+
+def test_rules_are_evaluated_per_column():
+    columns = {
+        "Title": pd.Series(["A", "", "Unknown Product"]),
+        "Price": pd.Series([1.0, np.nan, 2.0]),
+    }
+    valid, failures = validate(columns)
+    assert valid.tolist() == [True, False, False]
+    assert failures["title_missing"].tolist() == [False, True, False]
+    assert failures["title_unknown"].tolist() == [False, False, True]
+    assert failures["price_invalid"].tolist() == [False, True, False]
+    # rules for absent columns are skipped
+    assert "rating_invalid" not in failures
+
+def test_reasons_list_every_failed_rule():
+    failures = {"a": np.array([True, False, True]), "b": np.array([True, False, False])}
+    rejected = np.array([True, False, True])
+    assert reasons(failures, rejected).tolist() == ["a,b", "a"]
+
+def test_rejected_rows_quarantined_with_reasons(rows):
+    quarantine = Quarantine()
+    df = clean_and_transform(rows, quarantine=quarantine)
+
+    assert df["Title"].tolist() == ["A", "D"]
+    assert df["Size"].tolist() == ["M", "Unknown"]
+    assert df["Gender"].tolist() == ["Men", "Unknown"]
+
+    rejected = quarantine.frame()
+    assert rejected["Title"].tolist() == [None, "Unknown Product", "B", "C"]
+    assert rejected["Reason"].tolist() == [
+        "title_missing",
+        "title_unknown,price_invalid",
+        "rating_invalid,colors_invalid",
+        "scraped_at_invalid",
+    ]
+    # the raw values are kept for inspection
+    assert rejected["Price"].tolist()[1] == "Price Unavailable"
+    assert quarantine.counts == {
+        "title_missing": 1, "title_unknown": 1, "price_invalid": 1,
+        "rating_invalid": 1, "colors_invalid": 1, "scraped_at_invalid": 1,
+    }
+    assert quarantine.summary().startswith("4 rows quarantined")
+
+def test_quarantine_collects_across_chunks(rows, tmp_path):
+    quarantine = Quarantine()
+    chunks = list(transform_chunks([rows, rows], chunk_size=4, quarantine=quarantine))
+    assert sum(len(chunk) for chunk in chunks) == 4
+    assert len(quarantine) == 8
+
+    path = tmp_path / "quarantine.csv"
+    quarantine.save(str(path))
+    saved = pd.read_csv(path)
+    assert len(saved) == 8
+    assert "Reason" in saved.columns
+
+def test_empty_quarantine():
+    quarantine = Quarantine()
+    assert len(quarantine) == 0
+    assert quarantine.summary() == "no rows quarantined"
+    assert list(quarantine.frame().columns) == ["Reason"]
+
+def test_rule_names_are_unique():
+    names = [rule.name for rule in RULES]
+    assert len(names) == len(set(names))
@@ -0,0 +1,128 @@
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+
+DEFAULT_ARCHIVE_PATH = '.cache/pages_archive'
+DATA_MAGIC = b'FSARC001'
+INDEX_MAGIC = b'FSIDX001'
+# url key, offset, compressed length, raw length
+INDEX_RECORD = struct.Struct('<16sQII')
+
+def url_key(url: str) -> bytes:
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+
+def _paths(path: str):
+    return os.path.join(path, 'pages.bin'), os.path.join(path, 'pages.idx')
+
+def _read_index(index_file: str) -> dict:
+    entries = {}
+    if not os.path.exists(index_file):
+        return entries
+    with open(index_file, 'rb') as f:
+        data = f.read()
+    if data[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+        raise ValueError(f"{index_file} is not a page archive index")
+    for key, offset, length, raw_length in INDEX_RECORD.iter_unpack(data[len(INDEX_MAGIC):]):
+        entries[key] = (offset, length, raw_length)
+    return entries
+
+
+# record mode: every record is compressed on its own so it can be read back without the rest
+class ArchiveWriter:
+    def __init__(self, path: str = DEFAULT_ARCHIVE_PATH, level: int = 6):
+        os.makedirs(path, exist_ok=True)
+        self.data_file, self.index_file = _paths(path)
+        self.level = level
+        self.entries = _read_index(self.index_file)
+        self.data = open(self.data_file, 'ab')
+        if self.data.tell() == 0:
+            self.data.write(DATA_MAGIC)
+        self.recorded = 0
+
+    def add(self, url: str, body: bytes):
+        blob = zlib.compress(url.encode('utf-8') + b'\0' + body, self.level)
+        offset = self.data.tell()
+        self.data.write(blob)
+        # a url recorded again points at its latest body
+        self.entries[url_key(url)] = (offset, len(blob), len(body))
+        self.recorded += 1
+
+    # index is written sorted by key, so readers can binary search it in place
+    def close(self):
+        self.data.close()
+        tmp = self.index_file + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(INDEX_MAGIC)
+            for key in sorted(self.entries):
+                f.write(INDEX_RECORD.pack(key, *self.entries[key]))
+        os.replace(tmp, self.index_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# replay mode: data and index are memory-mapped, lookups never load the whole archive
+class PageArchive:
+    def __init__(self, path: str = DEFAULT_ARCHIVE_PATH):
+        data_file, index_file = _paths(path)
+        self.hits = 0
+        self.misses = 0
+        with open(index_file, 'rb') as f:
+            self.index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.index[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError(f"{index_file} is not a page archive index")
+        with open(data_file, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = (len(self.index) - len(INDEX_MAGIC)) // INDEX_RECORD.size
+
+    def __len__(self):
+        return self.count
+
+    def _record(self, i: int):
+        return INDEX_RECORD.unpack_from(self.index, len(INDEX_MAGIC) + i * INDEX_RECORD.size)
+
+    def _find(self, key: bytes):
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            record = self._record(mid)
+            if record[0] < key:
+                low = mid + 1
+            elif record[0] > key:
+                high = mid
+            else:
+                return record
+        return None
+
+    def get(self, url: str):
+        record = self._find(url_key(url))
+        if record is None:
+            self.misses += 1
+            return None
+        _, offset, length, _ = record
+        stored_url, _, body = zlib.decompress(self.data[offset:offset + length]).partition(b'\0')
+        if stored_url.decode('utf-8') != url:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return body
+
+    def urls(self):
+        for i in range(self.count):
+            _, offset, length, _ = self._record(i)
+            yield zlib.decompress(self.data[offset:offset + length]).partition(b'\0')[0].decode('utf-8')
+
+    def close(self):
+        self.index.close()
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
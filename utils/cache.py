@@ -0,0 +1,92 @@
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = '.cache/pages.sqlite'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# on-disk http cache keyed by url, validated with etag / last-modified
+class PageCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pages_last_used ON pages (last_used)")
+        self.conn.commit()
+
+    def conditional_headers(self, url: str) -> dict:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return {}
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    # 304 not modified: serve the stored body
+    def hit(self, url: str):
+        with self.lock:
+            row = self.conn.execute("SELECT body FROM pages WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE pages SET last_used = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def store(self, url: str, body: bytes, etag: str = None, last_modified: str = None):
+        with self.lock:
+            self.misses += 1
+            if not etag and not last_modified:
+                return
+            if len(body) > self.max_bytes:
+                return
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, body, etag, last_modified, size, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, len(body), time.time()),
+            )
+            self._evict()
+            self.conn.commit()
+
+    # drop least recently used pages until the cache fits in max_bytes
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self.conn.execute("SELECT url, size FROM pages ORDER BY last_used").fetchall():
+            self.conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def size(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def summary(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses"
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
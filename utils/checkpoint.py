@@ -0,0 +1,68 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from utils.records import PageRecords
+
+DEFAULT_CHECKPOINT_PATH = '.cache/checkpoint.sqlite'
+
+def _encode(products: PageRecords) -> str:
+    return json.dumps(products.as_dict(), ensure_ascii=False)
+
+def _decode(text: str) -> PageRecords:
+    return PageRecords.from_dict(json.loads(text))
+
+
+# page-by-page crawl progress, so a crashed or interrupted run can resume where it stopped
+class CrawlCheckpoint:
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH, resume: bool = False):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages (page_num INTEGER PRIMARY KEY, url TEXT NOT NULL, products TEXT NOT NULL, completed_at TEXT NOT NULL)"
+        )
+        self.conn.commit()
+        # a fresh run forgets the previous crawl
+        if not resume:
+            self.clear()
+
+    # each page is committed on its own, a crash loses at most the page in flight
+    def record(self, page_num: int, url: str, products: PageRecords):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (page_num, url, products, completed_at) VALUES (?, ?, ?, ?)",
+                (page_num, url, _encode(products), datetime.now().isoformat()),
+            )
+            self.conn.commit()
+
+    # finished pages whose url still matches the crawl being resumed, urls maps page number to url
+    def completed(self, urls: dict) -> dict:
+        with self.lock:
+            rows = self.conn.execute("SELECT page_num, url, products FROM pages ORDER BY page_num").fetchall()
+        return {page_num: _decode(products) for page_num, url, products in rows if urls.get(page_num) == url}
+
+    def last_page(self) -> int:
+        with self.lock:
+            row = self.conn.execute("SELECT MAX(page_num) FROM pages").fetchone()
+        return row[0] or 0
+
+    def finished(self, pages: int, start_page: int = 1) -> bool:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*) FROM pages WHERE page_num BETWEEN ? AND ?", (start_page, pages)
+            ).fetchone()
+        return row[0] == pages - start_page + 1
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM pages")
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,90 @@
+import json
+from dataclasses import dataclass, fields, replace
+
+from utils.extract import DEFAULT_PARSER
+from utils.load import DEFAULT_DESTINATIONS, CREDENTIAL_FILE, HISTORY_PATH, check_destinations
+
+# every knob of one pipeline run, loaded from a json file and overridden from the command line
+@dataclass
+class PipelineConfig:
+    # crawl: pages start_page..pages
+    start_page: int = 1
+    pages: int = 50
+    delay: float = 0.5
+    concurrency: int = 1
+    rate_limit: float = None
+    parser: str = DEFAULT_PARSER
+    parse_workers: int = 1
+    shards: int = 1
+
+    # pipeline modes
+    incremental: bool = False
+    streaming: bool = False
+    chunk_size: int = 200
+    typed: bool = False
+    dedup: bool = False
+    resume: bool = False
+    record: str = None
+    replay: str = None
+
+    # sinks and credentials
+    destinations: tuple = DEFAULT_DESTINATIONS
+    filename_csv: str = 'fashion_data.csv'
+    parquet_path: str = 'fashion_data_parquet'
+    history_path: str = HISTORY_PATH
+    db_name: str = 'fashion_db'
+    user: str = 'wafanur'
+    password: str = 'wafanur444'
+    db_host: str = 'localhost'
+    db_port: int = 5432
+    table_name: str = 'products'
+    pg_method: str = 'copy'
+    spreadsheet_id: str = '1JAnu0DVGOaoWZSxZ-q1s6M-2KtIAH16JT6_yzoZNAQs'
+    range_name: str = 'Sheet1!A1'
+    credential_file: str = CREDENTIAL_FILE
+    sheets_diff: bool = False
+    timeouts: dict = None
+
+    # reporting
+    report_path: str = 'run_report.json'
+    profile: str = None
+    trace_memory: bool = False
+
+    # scheduling: repeat every N seconds, runs=None repeats forever
+    every: float = None
+    runs: int = None
+
+    def __post_init__(self):
+        # a bare string would be split into letters by tuple()
+        if isinstance(self.destinations, str):
+            raise ValueError(f"destinations must be a list of sink names, got the string {self.destinations!r}")
+        self.destinations = tuple(self.destinations)
+        check_destinations(self.destinations)
+        if self.start_page < 1 or self.pages < self.start_page:
+            raise ValueError(f"Invalid page range: {self.start_page}-{self.pages}")
+        if self.shards < 1:
+            raise ValueError("shards must be at least 1")
+        if self.shards > 1 and (self.streaming or self.record):
+            raise ValueError("sharded runs cannot stream or record, each shard loads once through the parent")
+
+    @classmethod
+    def from_file(cls, path: str, **overrides) -> 'PipelineConfig':
+        with open(path) as f:
+            options = json.load(f)
+        known = {item.name for item in fields(cls)}
+        unknown = set(options) - known
+        if unknown:
+            raise ValueError(f"Unknown config keys in {path}: {', '.join(sorted(unknown))}")
+        return cls(**{**options, **overrides})
+
+    def with_options(self, **overrides) -> 'PipelineConfig':
+        return replace(self, **overrides)
+
+    # keyword arguments for load_data
+    def load_options(self) -> dict:
+        names = (
+            'filename_csv', 'db_name', 'user', 'password', 'spreadsheet_id', 'range_name', 'table_name', 'pg_method',
+            'destinations', 'parquet_path', 'timeouts', 'sheets_diff', 'db_host', 'db_port', 'credential_file',
+            'history_path',
+        )
+        return {name: getattr(self, name) for name in names}
@@ -0,0 +1,107 @@
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import metrics
+
+DEFAULT_INDEX_PATH = '.cache/fingerprints.sqlite'
+FINGERPRINT_FIELDS = ('Title', 'Price', 'Size', 'Gender', 'Colors')
+WHITESPACE = re.compile(r'\s+')
+LOOKUP_CHUNK = 500
+
+def _text(series: pd.Series) -> pd.Series:
+    return series.astype(str).str.strip().str.casefold()
+
+NORMALIZERS = {
+    'Title': lambda s: _text(s).str.replace(WHITESPACE, ' ', regex=True),
+    'Price': lambda s: s.astype(float).round(1).map('{:.1f}'.format),
+    'Size': _text,
+    'Gender': _text,
+    'Colors': lambda s: s.astype('int64').astype(str),
+}
+
+# one 64-bit fingerprint per cleaned row over the normalized fields, stable across runs
+def fingerprints(df: pd.DataFrame, fields: tuple = FINGERPRINT_FIELDS) -> np.ndarray:
+    if df.empty:
+        return np.empty(0, dtype='int64')
+    normalized = pd.DataFrame({name: NORMALIZERS[name](df[name]) for name in fields})
+    hashed = pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+    # sqlite integers are signed
+    return hashed.view('int64')
+
+
+# persistent set of product fingerprints, so the same product is stored once across runs
+class FingerprintIndex:
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # the fingerprint is the rowid, so the table is its own index
+        self.conn.execute("CREATE TABLE IF NOT EXISTS fingerprints (fp INTEGER PRIMARY KEY, first_seen TEXT NOT NULL)")
+        self.conn.commit()
+        # new fingerprints are only written by commit(), after the rows have been loaded
+        self.pending = set()
+        self.duplicates_in_run = 0
+        self.duplicates_known = 0
+
+    def _known(self, fps: list) -> set:
+        known = set()
+        for start in range(0, len(fps), LOOKUP_CHUNK):
+            chunk = fps[start:start + LOOKUP_CHUNK]
+            rows = self.conn.execute(
+                f"SELECT fp FROM fingerprints WHERE fp IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            known.update(fp for fp, in rows)
+        return known
+
+    # keeps only rows whose fingerprint was not seen before, in this run or an earlier one
+    def filter(self, df: pd.DataFrame) -> pd.DataFrame:
+        fps = fingerprints(df).tolist()
+        if not fps:
+            return df
+        keep = np.zeros(len(fps), dtype=bool)
+        in_run = known_before = 0
+        with self.lock:
+            known = self._known(list(set(fps)))
+            # one set lookup per row as the batch streams through
+            for i, fp in enumerate(fps):
+                if fp in self.pending:
+                    in_run += 1
+                elif fp in known:
+                    known_before += 1
+                else:
+                    self.pending.add(fp)
+                    keep[i] = True
+            self.duplicates_in_run += in_run
+            self.duplicates_known += known_before
+        metrics.incr('dedup.in_run', in_run)
+        metrics.incr('dedup.known', known_before)
+        return df[keep]
+
+    def commit(self):
+        now = datetime.now().isoformat()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO fingerprints (fp, first_seen) VALUES (?, ?)",
+                [(fp, now) for fp in self.pending],
+            )
+            self.conn.commit()
+            self.pending.clear()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def summary(self) -> str:
+        return f"{self.duplicates_in_run} duplicates within the run, {self.duplicates_known} already stored"
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
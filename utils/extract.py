@@ -1,15 +1,50 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from datetime import datetime
 import pandas as pd
 import re
+import random
 import time
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlparse
+from utils.cache import PageCache
+from utils.metrics import metrics, delta
+from utils.records import FIELDS, PageRecords, records_to_frame
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+if etree is not None:
+    _LXML_PARSER = etree.HTMLParser(encoding='utf-8')
+    # decoded text carries no encoding to force
+    _LXML_TEXT_PARSER = etree.HTMLParser()
+    _CARD_XPATH = etree.XPath("//div[contains(concat(' ', normalize-space(@class), ' '), ' collection-card ')]")
 
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2.1 Safari/605.1.15"
     )
 }
+BASE_URL = 'https://fashion-studio.dicoding.dev/'
+DEFAULT_PARSER = 'lxml' if etree is not None else 'bs4'
+POOL_SIZE = 16
+MAX_RETRIES = 3
+BACKOFF = 0.5
+RETRY_BUDGET = 20
+
+# keyword, pattern and fallback of every paragraph field, compiled once
+PARAGRAPH_FIELDS = (
+    ("Rating", "Rating", re.compile(r"Rating:\s*(⭐\s*\d+(?:\.\d+)?)"), None),
+    ("Colors", "Colors", re.compile(r"(\d+)\s*Colors"), None),
+    ("Size", "Size", re.compile(r"Size:\s*(\w+)"), None),
+    ("Gender", "Gender", re.compile(r"Gender:\s*(\w+)"), None),
+)
+
 def extract_bersih(paragraphs, keyword, pattern, fallback="N/A"):
     for p in paragraphs:
         if p.string and keyword in p.string:
@@ -18,77 +53,400 @@ def extract_bersih(paragraphs, keyword, pattern, fallback="N/A"):
                 return found.group(1).strip()
     return fallback
 
+# same result as extract_bersih for every field, in one pass over the paragraph strings
+def extract_fields(strings):
+    found = {}
+    for text in strings:
+        if not text:
+            continue
+        for field, keyword, pattern, _ in PARAGRAPH_FIELDS:
+            if field not in found and keyword in text:
+                match = pattern.search(text)
+                if match:
+                    found[field] = match.group(1).strip()
+        if len(found) == len(PARAGRAPH_FIELDS):
+            break
+    return {field: found.get(field, fallback) for field, _, _, fallback in PARAGRAPH_FIELDS}
+
+# missing fields stay None, clean_and_transform validates them and quarantines the row with a reason
 def extract_product(card):
-    try:
-        title_tag = card.select_one('.product-details h3.product-title') or card.find('h3', class_='product-title')
-        title = title_tag.get_text(strip=True) if title_tag and title_tag.get_text(strip=True) else "Unknown Title"
-
-        price_tag = card.find('div', class_='price-container')
-        price = price_tag.get_text(strip=True) if price_tag else "Price Not Available"
-
-        paragraphs = card.find_all('p')
-
-        rating = extract_bersih(paragraphs, "Rating", r"Rating:\s*(⭐\s*\d+(?:\.\d+)?)", "Invalid Rating")
-        colors = extract_bersih(paragraphs, "Colors", r"(\d+)\s*Colors", "No Colors")
-        size = extract_bersih(paragraphs, "Size", r"Size:\s*(\w+)", "Unknown")
-        gender = extract_bersih(paragraphs, "Gender", r"Gender:\s*(\w+)", "Unknown")
-
-        timestamp = datetime.now()
-
-        return {
-            "Title": title,
-            "Price": price,
-            "Rating": rating,
-            "Colors": colors,
-            "Size": size,
-            "Gender": gender,
-            "ScrapedAt": timestamp
-        }
-    except Exception as e:
-        print(f"Error during product extraction: {e}")
+    return dict(zip(FIELDS, product_values(card)), ScrapedAt=datetime.now())
+
+# the fields of one card in FIELDS order, the scrape timestamp belongs to the page
+def product_values(card):
+    title_tag = card.select_one('.product-details h3.product-title') or card.find('h3', class_='product-title')
+    title = (title_tag.get_text(strip=True) if title_tag else None) or None
+
+    price_tag = card.find('div', class_='price-container')
+    price = price_tag.get_text(strip=True) if price_tag else None
+
+    fields = extract_fields(p.string for p in card.find_all('p'))
+
+    return (title, price, fields["Rating"], fields["Colors"], fields["Size"], fields["Gender"])
+
+
+def _classes(el):
+    return (el.get('class') or '').split()
+
+def _text(el):
+    # bs4 get_text(strip=True)
+    return ''.join(text.strip() for text in el.itertext())
+
+def _string(el):
+    # bs4 Tag.string: the text of a tag with a single child, None otherwise
+    while True:
+        if len(el) == 0:
+            return el.text
+        if len(el) == 1 and not el.text and not el[0].tail:
+            el = el[0]
+            continue
         return None
-    
 
-def ambil_content_url(url: str):
+def _inside(el, class_name, card):
+    for parent in el.iterancestors():
+        if class_name in _classes(parent):
+            return True
+        if parent is card:
+            return False
+    return False
+
+def extract_product_lxml(card):
+    return dict(zip(FIELDS, product_values_lxml(card)), ScrapedAt=datetime.now())
+
+# lxml counterpart of product_values, all fields gathered in one walk over the card
+def product_values_lxml(card):
+    title_tag = None
+    any_title_tag = None
+    price_tag = None
+    strings = []
+    for el in card.iterdescendants():
+        tag = el.tag
+        if tag == 'p':
+            strings.append(_string(el))
+        elif tag == 'h3' and 'product-title' in _classes(el):
+            if any_title_tag is None:
+                any_title_tag = el
+            if title_tag is None and _inside(el, 'product-details', card):
+                title_tag = el
+        elif tag == 'div' and price_tag is None and 'price-container' in _classes(el):
+            price_tag = el
+
+    title_tag = title_tag if title_tag is not None else any_title_tag
+    title = (_text(title_tag) if title_tag is not None else None) or None
+    price = _text(price_tag) if price_tag is not None else None
+
+    fields = extract_fields(strings)
+
+    return (title, price, fields["Rating"], fields["Colors"], fields["Size"], fields["Gender"])
+
+# one keep-alive session per process, so pages reuse pooled connections
+_session = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+# retries shared by every page of a run
+class RetryBudget:
+    def __init__(self, retries: int = RETRY_BUDGET):
+        self.remaining = retries
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self.lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            self.used += 1
+            return True
+
+
+def _retryable(error: requests.RequestException) -> bool:
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code >= 500
+
+def ambil_content_url(url: str, max_retries: int = MAX_RETRIES, backoff: float = BACKOFF, budget: RetryBudget = None, cache: PageCache = None):
+    with metrics.stage('fetch'):
+        return _ambil_content_url(url, max_retries, backoff, budget, cache)
+
+def _ambil_content_url(url, max_retries, backoff, budget, cache):
+    session = get_session()
+    attempt = 0
+    while True:
+        try:
+            conditional = cache.conditional_headers(url) if cache is not None else {}
+            if conditional:
+                response = session.get(url, timeout=5, headers=conditional)
+                if response.status_code == 304:
+                    body = cache.hit(url)
+                    if body is not None:
+                        metrics.incr('cache_hits')
+                        return body
+                    # evicted meanwhile, fetch the full page
+                    response = session.get(url, timeout=5)
+            else:
+                response = session.get(url, timeout=5)
+            response.raise_for_status()
+            if cache is not None:
+                cache.store(url, response.content, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            metrics.incr('bytes_fetched', len(response.content))
+            return response.content
+        except requests.RequestException as e:
+            if attempt >= max_retries or not _retryable(e) or (budget is not None and not budget.take()):
+                print(f"Error fetching content from {url}")
+                metrics.incr('fetch_failures')
+                return None
+            # exponential backoff with full jitter
+            wait = random.uniform(0, backoff * 2 ** attempt)
+            attempt += 1
+            metrics.incr('fetch_retries')
+            print(f"Retrying {url} in {wait:.2f}s ({attempt}/{max_retries}): {e}")
+            time.sleep(wait)
+
+# token bucket, shared by every worker hitting the same host
+class RateLimiter:
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_host_limiters = {}
+_host_limiters_lock = threading.Lock()
+
+def host_limiter(url: str, rate: float, burst: int = 1) -> RateLimiter:
+    host = urlparse(url).netloc
+    with _host_limiters_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None or limiter.rate != rate or limiter.burst != burst:
+            limiter = RateLimiter(rate, burst)
+            _host_limiters[host] = limiter
+        return limiter
+
+
+def page_url(page_num: int, base_url: str = BASE_URL) -> str:
+    return base_url if page_num == 1 else f'{base_url}page{page_num}'
+
+def _cards_bs4(html_content):
+    soup = BeautifulSoup(html_content, 'html.parser')
+    return soup.find_all('div', class_='collection-card')
+
+def _cards_lxml(html_content):
+    parser = _LXML_PARSER if isinstance(html_content, bytes) else _LXML_TEXT_PARSER
+    root = etree.fromstring(html_content, parser)
+    return _CARD_XPATH(root) if root is not None else []
+
+# parser backends: how to find the cards of a page and how to read one card
+# (extractors are looked up at call time so they can be patched)
+PARSERS = {
+    'bs4': (_cards_bs4, lambda card: product_values(card)),
+    'lxml': (_cards_lxml, lambda card: product_values_lxml(card)),
+}
+
+def get_parser(name: str):
+    if name == 'lxml' and etree is None:
+        print("lxml is not installed, falling back to the bs4 parser.")
+        name = 'bs4'
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser backend: {name}")
+    return PARSERS[name]
+
+def parse_page(html_content, page_num: int, parser: str = 'bs4'):
+    with metrics.stage('parse'):
+        return _parse_page(html_content, page_num, parser)
+
+# the cards of a page are read straight into column lists, one timestamp per page
+def _parse_page(html_content, page_num, parser):
+    find_cards, read_card = get_parser(parser)
+    products = PageRecords()
     try:
-        response = requests.get(url, headers=HEADERS, timeout=5)
-        response.raise_for_status()
-        return response.content
-    except requests.RequestException:
-        print(f"Error fetching content from {url}")
-        return None
+        cards = find_cards(html_content)
+        metrics.incr('pages_parsed')
+        metrics.incr('cards', len(cards))
 
-def scrape_fashion(pages, delay=0.5):
-    all_products = []
-    for page_num in range(1, pages + 1):
-        url = 'https://fashion-studio.dicoding.dev/' if page_num == 1 else f'https://fashion-studio.dicoding.dev/page{page_num}'
-        print(f"Processing page: {url}")
+        if not cards:
+            print(f"No products found on page {page_num}.")
+            return products
 
-        html_content = ambil_content_url(url)
-        if not html_content:
-            print(f"Failed to retrieve data from page {page_num}, stopping scraping.")
-            break
+        for card in cards:
+            products.append(read_card(card))
+
+    except Exception as e:
+        print(f"Error parsing page {page_num}: {e}")
+        metrics.incr('page_parse_errors')
+        # a page that fails midway yields no products
+        return PageRecords(products.scraped_at)
+    return products
+
+# every fetch, serial or concurrent, waits for the host's token bucket
+def _fetch_page(url, rate_limit, burst, budget, cache):
+    if rate_limit:
+        host_limiter(url, rate_limit, burst).acquire()
+    return ambil_content_url(url, budget=budget, cache=cache)
 
+def _fetch_pages(urls, concurrency, rate_limit, burst, budget, cache):
+    pending = deque()
+    # bounded look-ahead, so fetched bodies do not pile up while parsing or loading is slower
+    max_pending = concurrency * 2
+
+    # futures are consumed in submit order, so pages are handled exactly as in the serial loop
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            cards = soup.find_all('div', class_='collection-card')
+            for url in urls:
+                pending.append(executor.submit(_fetch_page, url, rate_limit, burst, budget, cache))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
 
-            if not cards:
-                print(f"No products found on page {page_num}.")
-                continue
+# runs in a worker process, so its metrics travel back with the results
+def _parse_batch(batch, parser):
+    before = metrics.snapshot()
+    results = [parse_page(html_content, page_num, parser) for page_num, html_content in batch]
+    return results, delta(before, metrics.snapshot())
 
-            for card in cards:
-                product = extract_product(card)
-                if product:
-                    all_products.append(product)
+# parse (page_num, html) pairs, on a process pool when workers > 1, yielding (page_num, products) in input order
+def parse_pages(pages, parser='bs4', workers=1, chunksize=4):
+    if workers <= 1:
+        for page_num, html_content in pages:
+            yield page_num, parse_page(html_content, page_num, parser)
+        return
 
-        except Exception as e:
-            print(f"Error parsing page {page_num}: {e}")
-            continue
+    pending = deque()
+    batch = []
+    # bounded look-ahead, so raw pages do not pile up in memory
+    max_pending = workers * 2
+
+    def drain(limit):
+        while len(pending) > limit:
+            page_nums, future = pending.popleft()
+            results, (timers, counters) = future.result()
+            metrics.merge(timers, counters)
+            yield from zip(page_nums, results)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for page_num, html_content in pages:
+            batch.append((page_num, html_content))
+            if len(batch) >= chunksize:
+                pending.append(([num for num, _ in batch], executor.submit(_parse_batch, batch, parser)))
+                batch = []
+                yield from drain(max_pending)
+        if batch:
+            pending.append(([num for num, _ in batch], executor.submit(_parse_batch, batch, parser)))
+        yield from drain(0)
+
+# yields the PageRecords of each page as soon as it is parsed
+def scrape_fashion_pages(pages, delay=0.5, concurrency=1, rate_limit=None, burst=1, base_url=BASE_URL, retry_budget=RETRY_BUDGET, cache=None, state=None, parser='bs4', parse_workers=1, parse_chunksize=4, recorder=None, archive=None, checkpoint=None, start_page=1):
+    # pages start_page..pages, so a crawl can be split into page ranges
+    urls = {page_num: page_url(page_num, base_url) for page_num in range(start_page, pages + 1)}
+    budget = RetryBudget(retry_budget)
+
+    # resumed pages come back from the checkpoint, only the rest is fetched
+    done = checkpoint.completed(urls) if checkpoint is not None else {}
+    todo = [(page_num, url) for page_num, url in urls.items() if page_num not in done]
+    if done:
+        print(f"Resuming crawl, {len(done)} pages restored from the checkpoint (last page {max(done)}).")
+        metrics.incr('pages_resumed', len(done))
+
+    # without an explicit rate the fixed delay becomes one, so serial and concurrent crawls are both paced
+    if rate_limit is None and delay:
+        rate_limit = 1 / delay
+        if concurrency > 1 and archive is None:
+            print(f"No rate limit set, {concurrency} concurrent fetches are capped at {rate_limit:g} req/s by delay={delay:g}.")
+
+    # replay mode reads pages from a recorded archive, with no network and no pacing
+    if archive is not None:
+        contents = (archive.get(url) for _, url in todo)
+    elif concurrency > 1:
+        contents = _fetch_pages([url for _, url in todo], concurrency, rate_limit, burst, budget, cache)
+    else:
+        contents = None
+
+    def fetched():
+        for page_num, url in todo:
+            print(f"Processing page: {url}")
 
-        time.sleep(delay) 
+            html_content = next(contents) if contents is not None else _fetch_page(url, rate_limit, burst, budget, cache)
+            if not html_content:
+                print(f"Failed to retrieve data from page {page_num}, stopping scraping.")
+                metrics.incr('pages_failed')
+                break
+            metrics.incr('pages_fetched')
+
+            # record mode keeps the raw bytes for later offline replay
+            if recorder is not None:
+                recorder.add(url, html_content)
+
+            # incremental mode: unchanged pages are not parsed
+            if state is not None and not state.page_changed(url, html_content):
+                print(f"Page {page_num} unchanged since last run, skipping.")
+                metrics.incr('pages_unchanged')
+                if checkpoint is not None:
+                    checkpoint.record(page_num, url, PageRecords())
+            else:
+                yield page_num, html_content
+
+    def parsed():
+        yield from done.items()
+        for page_num, products in parse_pages(fetched(), parser, parse_workers, parse_chunksize):
+            if checkpoint is not None:
+                checkpoint.record(page_num, urls[page_num], products)
+            yield page_num, products
+
+    try:
+        for page_num, products in parsed():
+            # incremental mode: only new/changed products are kept
+            if state is not None:
+                products = products.filter(lambda values: state.values_changed(values, urls[page_num]))
+            metrics.incr('products_emitted', len(products))
+            yield products
+    finally:
+        # cancels any pages still queued after an early stop
+        if contents is not None:
+            contents.close()
+        if budget.used:
+            print(f"Retries used: {budget.used}/{retry_budget}")
+
+def scrape_fashion(pages, delay=0.5, **kwargs):
+    all_products = []
+    for products in scrape_fashion_pages(pages, delay, **kwargs):
+        all_products.extend(products)
     return all_products
 
+# same crawl as scrape_fashion, but the pages go into one frame without a dict per product
+def scrape_fashion_frame(pages, delay=0.5, **kwargs) -> pd.DataFrame:
+    return records_to_frame(scrape_fashion_pages(pages, delay, **kwargs))
+
 if __name__ == "__main__":
     result = scrape_fashion(pages=2)
     for item in result:
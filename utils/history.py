@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from utils.dedup import fingerprints
+from utils.transform import iso_millis
+
+HISTORY_PATH = 'fashion_history.sqlite'
+# a product keeps its identity when only the price or rating changes
+PRODUCT_KEY = ('Title', 'Size', 'Gender', 'Colors')
+
+
+# embedded, append-only store of every loaded run, for price history without a database server
+class HistoryStore:
+    def __init__(self, path: str = HISTORY_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                loaded_at TEXT NOT NULL,
+                rows INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS products (
+                snapshot_id INTEGER NOT NULL REFERENCES snapshots (snapshot_id),
+                product_id INTEGER NOT NULL,
+                Title TEXT, Price REAL, Rating REAL, Colors INTEGER, Size TEXT, Gender TEXT,
+                ScrapedAt TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS products_by_product ON products (product_id, ScrapedAt);
+            CREATE INDEX IF NOT EXISTS products_by_time ON products (ScrapedAt);
+            CREATE INDEX IF NOT EXISTS products_by_title ON products (Title);
+        """)
+        self.conn.commit()
+
+    # an empty snapshot, for a run that appends its rows in several chunks
+    def new_snapshot(self) -> int:
+        with self.lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO snapshots (loaded_at, rows) VALUES (?, 0)", (datetime.now().isoformat(),)
+            )
+        return cursor.lastrowid
+
+    # every call is one snapshot unless snapshot_id names an existing one, written in a single transaction
+    def append(self, df: pd.DataFrame, snapshot_id: int = None) -> int:
+        scraped_at = df['ScrapedAt']
+        if pd.api.types.is_datetime64_any_dtype(scraped_at):
+            scraped_at = iso_millis(scraped_at)
+        frame = pd.DataFrame({
+            'product_id': fingerprints(df, PRODUCT_KEY),
+            'Title': df['Title'].astype(str).to_numpy(),
+            'Price': df['Price'].astype(float).to_numpy(),
+            'Rating': df['Rating'].astype(float).to_numpy(),
+            'Colors': df['Colors'].astype('int64').to_numpy(),
+            'Size': df['Size'].astype(str).to_numpy(),
+            'Gender': df['Gender'].astype(str).to_numpy(),
+            'ScrapedAt': scraped_at.astype(str).to_numpy(),
+        })
+        with self.lock, self.conn:
+            if snapshot_id is None:
+                cursor = self.conn.execute(
+                    "INSERT INTO snapshots (loaded_at, rows) VALUES (?, ?)", (datetime.now().isoformat(), len(frame))
+                )
+                snapshot_id = cursor.lastrowid
+            else:
+                self.conn.execute("UPDATE snapshots SET rows = rows + ? WHERE snapshot_id = ?", (len(frame), snapshot_id))
+            self.conn.executemany(
+                "INSERT INTO products (snapshot_id, product_id, Title, Price, Rating, Colors, Size, Gender, ScrapedAt) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((snapshot_id, *row) for row in frame.itertuples(index=False, name=None)),
+            )
+        return snapshot_id
+
+    def query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        with self.lock:
+            return pd.read_sql_query(sql, self.conn, params=params)
+
+    def snapshots(self) -> pd.DataFrame:
+        return self.query("SELECT snapshot_id, loaded_at, rows FROM snapshots ORDER BY snapshot_id")
+
+    # price over time for one product, by product id or by title
+    def price_history(self, product_id: int = None, title: str = None, since: str = None) -> pd.DataFrame:
+        if product_id is None and title is None:
+            raise ValueError("price_history needs a product_id or a title")
+        conditions, params = [], []
+        if product_id is not None:
+            conditions.append("product_id = ?")
+            params.append(int(product_id))
+        if title is not None:
+            conditions.append("product_id IN (SELECT DISTINCT product_id FROM products WHERE Title = ?)")
+            params.append(title)
+        if since is not None:
+            conditions.append("ScrapedAt >= ?")
+            params.append(since)
+        return self.query(
+            "SELECT product_id, Title, Size, Gender, Colors, ScrapedAt, Price, Rating, snapshot_id FROM products "
+            f"WHERE {' AND '.join(conditions)} ORDER BY product_id, ScrapedAt",
+            tuple(params),
+        )
+
+    # the most recent row of every product, optionally as of a point in time
+    def latest(self, as_of: str = None) -> pd.DataFrame:
+        where, params = ("WHERE ScrapedAt <= ?", (as_of,)) if as_of is not None else ("", ())
+        # sqlite returns the other columns from the row holding the MAX
+        return self.query(
+            "SELECT product_id, Title, Price, Rating, Colors, Size, Gender, MAX(ScrapedAt) AS ScrapedAt, snapshot_id "
+            f"FROM products {where} GROUP BY product_id ORDER BY Title, product_id",
+            params,
+        )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -1,15 +1,144 @@
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
 import pandas as pd
 from sqlalchemy import create_engine
+from sqlalchemy.types import REAL, SmallInteger, String, TIMESTAMP
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
+from utils.metrics import metrics
+from utils.transform import iso_millis
+from utils.history import HistoryStore, HISTORY_PATH
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pa_dataset
+except ImportError:
+    pa = None
+
+@dataclass
+class LoadResult:
+    destination: str
+    rows: int = 0
+    bytes: int = 0
+    duration: float = 0.0
+    error: str = None
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+@dataclass
+class LoadReport:
+    results: list = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results)
+
+    @property
+    def failed(self) -> list:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def rows(self) -> dict:
+        return {result.destination: result.rows for result in self.results}
+
+    # fold in the report of another chunk, one result per destination
+    def add(self, other: 'LoadReport'):
+        totals = {result.destination: result for result in self.results}
+        for result in other.results:
+            total = totals.get(result.destination)
+            if total is None:
+                total = totals[result.destination] = LoadResult(result.destination)
+                self.results.append(total)
+            total.rows += result.rows
+            total.bytes += result.bytes
+            total.duration += result.duration
+            total.error = total.error or result.error
+            total.timed_out = total.timed_out or result.timed_out
+        self.duration += other.duration
+
+    def summary(self) -> str:
+        lines = [f"Load finished in {self.duration:.2f}s"]
+        for result in self.results:
+            status = 'ok' if result.ok else f'FAILED ({result.error})'
+            lines.append(f"  {result.destination:<10} {result.rows:>8} rows {result.bytes:>10} bytes {result.duration:7.2f}s  {status}")
+        return "\n".join(lines)
+
+def _path_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+# typed schema columns written back as text, the way the default schema stores them
+def _text_frame(df: pd.DataFrame) -> pd.DataFrame:
+    converted = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            converted[col] = iso_millis(series)
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            converted[col] = series.astype(object)
+        elif series.dtype == 'float32':
+            # shortest float32 repr, so 4.7 does not become 4.699999809
+            converted[col] = series.astype(str).astype(float)
+    return df.assign(**converted) if converted else df
+
+# native postgres column types for the typed schema
+def _sql_dtypes(df: pd.DataFrame) -> dict:
+    dtypes = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            longest = max((len(str(c)) for c in series.cat.categories), default=1)
+            dtypes[col] = String(longest)
+        elif series.dtype in ('int8', 'int16'):
+            dtypes[col] = SmallInteger()
+        elif series.dtype == 'float32':
+            dtypes[col] = REAL()
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            dtypes[col] = TIMESTAMP(timezone=series.dt.tz is not None)
+    return dtypes
 
 # save to csv
-def save_to_csv(df: pd.DataFrame, filename: str = 'fashion_data.csv'):
+def save_to_csv(df: pd.DataFrame, filename: str = 'fashion_data.csv', if_exists: str = 'replace'):
     try:
-        df.to_csv(filename, index=False)
+        df = _text_frame(df)
+        if if_exists == 'append' and os.path.exists(filename):
+            before = os.path.getsize(filename)
+            df.to_csv(filename, mode='a', header=False, index=False)
+        else:
+            before = 0
+            df.to_csv(filename, index=False)
         print(f"{filename} successfully saved")
+        return LoadResult('csv', rows=len(df), bytes=_path_size(filename) - before if os.path.exists(filename) else 0)
     except Exception as e:
         print(f"Failed to save data to CSV: {e}")
+        return LoadResult('csv', error=str(e))
+
+# one pooled engine per database url, reused across calls
+_engines = {}
+_engines_lock = threading.Lock()
+
+def get_engine(user: str, password: str, host: str, port: int, db_name: str):
+    url = f'postgresql+psycopg2://{user}:{password}@{host}:{port}/{db_name}'
+    with _engines_lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = create_engine(url, pool_size=5, pool_pre_ping=True)
+            _engines[url] = engine
+        return engine
 
 # save to postgresql
 def save_to_postgresql(
@@ -19,51 +148,374 @@ def save_to_postgresql(
     password: str = 'wafanur444',    
     host: str = 'localhost',
     port: int = 5432,
-    table_name: str = 'products'
+    table_name: str = 'products',
+    if_exists: str = 'replace'
 ):
     try:
-        engine = create_engine(f'postgresql+psycopg2://{user}:{password}@{host}:{port}/{db_name}')
-        df.to_sql(table_name, engine, index=False, if_exists='replace')
+        engine = get_engine(user, password, host, port, db_name)
+        dtypes = _sql_dtypes(df)
+        if dtypes:
+            df.to_sql(table_name, engine, index=False, if_exists=if_exists, dtype=dtypes)
+        else:
+            df.to_sql(table_name, engine, index=False, if_exists=if_exists)
         print(f"'{table_name}' successfully saved to database '{db_name}'")
+        return LoadResult('postgresql', rows=len(df))
     except Exception as e:
         print(f"Failed to save '{table_name}' to database '{db_name}': {e}")
+        return LoadResult('postgresql', error=str(e))
+
+
+NATURAL_KEY = ('Title', 'Size', 'Gender', 'Colors')
+COPY_CHUNK_ROWS = 10000
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+def _pg_type(series: pd.Series) -> str:
+    if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object:
+        return 'TEXT'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'TIMESTAMPTZ' if series.dt.tz is not None else 'TIMESTAMP'
+    if series.dtype in ('int8', 'int16'):
+        return 'SMALLINT'
+    if series.dtype == 'int32':
+        return 'INTEGER'
+    if pd.api.types.is_integer_dtype(series):
+        return 'BIGINT'
+    if series.dtype == 'float32':
+        return 'REAL'
+    if pd.api.types.is_float_dtype(series):
+        return 'DOUBLE PRECISION'
+    if pd.api.types.is_bool_dtype(series):
+        return 'BOOLEAN'
+    return 'TEXT'
+
+# file-like csv view of a frame, rendered chunk by chunk while COPY reads it
+class _CsvStream(io.RawIOBase):
+    def __init__(self, df: pd.DataFrame, chunk_rows: int = COPY_CHUNK_ROWS):
+        self.df = df
+        self.chunk_rows = chunk_rows
+        self.offset = 0
+        self.buffer = b''
+        self.sent = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while (size < 0 or len(self.buffer) < size) and self.offset < len(self.df):
+            chunk = self.df.iloc[self.offset:self.offset + self.chunk_rows]
+            self.buffer += chunk.to_csv(index=False, header=False).encode('utf-8')
+            self.offset += self.chunk_rows
+        if size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        self.sent += len(data)
+        return data
+
+# bulk load: COPY into a staging table, then upsert into the target on the natural key
+def save_to_postgresql_copy(
+    df: pd.DataFrame,
+    db_name: str = 'fashion_db',
+    user: str = 'wafanur',
+    password: str = 'wafanur444',
+    host: str = 'localhost',
+    port: int = 5432,
+    table_name: str = 'products',
+    if_exists: str = 'replace',
+    key_columns: tuple = NATURAL_KEY
+):
+    try:
+        engine = get_engine(user, password, host, port, db_name)
+        columns = list(df.columns)
+        key = [col for col in key_columns if col in columns]
+        if not key:
+            raise ValueError(f"none of the key columns {list(key_columns)} are in the data")
+        table = _quote(table_name)
+        staging = _quote(f'{table_name}_staging')
+        column_list = ', '.join(_quote(col) for col in columns)
+        key_list = ', '.join(_quote(col) for col in key)
+        updates = ', '.join(f'{_quote(col)} = EXCLUDED.{_quote(col)}' for col in columns if col not in key)
+        latest = f'{_quote("ScrapedAt")} DESC' if 'ScrapedAt' in columns else key_list
+
+        # one transaction: either the whole batch lands or nothing does
+        with engine.begin() as conn:
+            cursor = conn.connection.cursor()
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} ('
+                + ', '.join(f'{_quote(col)} {_pg_type(df[col])}' for col in columns)
+                + ')'
+            )
+            # emptied before the index is built, so duplicates left by the old to_sql loader cannot block it
+            if if_exists == 'replace':
+                cursor.execute(f'TRUNCATE {table}')
+            cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS {_quote(table_name + "_natural_key")} ON {table} ({key_list})')
+            cursor.execute(f'CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP')
+            stream = _CsvStream(_text_frame(df), COPY_CHUNK_ROWS)
+            cursor.copy_expert(f'COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)', stream)
+            # a key repeated inside the batch keeps its most recent row
+            cursor.execute(
+                f'INSERT INTO {table} ({column_list}) '
+                f'SELECT DISTINCT ON ({key_list}) {column_list} FROM {staging} ORDER BY {key_list}, {latest} '
+                f'ON CONFLICT ({key_list}) DO ' + (f'UPDATE SET {updates}' if updates else 'NOTHING')
+            )
+            # DISTINCT ON can drop rows, so count what the insert wrote
+            rows = cursor.rowcount
+            cursor.close()
+        print(f"'{table_name}' successfully upserted {rows} rows to database '{db_name}'")
+        return LoadResult('postgresql', rows=rows, bytes=stream.sent)
+    except Exception as e:
+        print(f"Failed to save '{table_name}' to database '{db_name}': {e}")
+        return LoadResult('postgresql', error=str(e))
+
+
+# save to parquet, one hive partition per scrape date
+def save_to_parquet(
+    df: pd.DataFrame,
+    path: str = 'fashion_data_parquet',
+    compression: str = 'zstd',
+    row_group_size: int = 100_000,
+    partition_by_date: bool = True,
+    if_exists: str = 'replace'
+):
+    try:
+        if pa is None:
+            raise ImportError("pyarrow is required for the parquet sink")
+        if partition_by_date:
+            scraped_at = df['ScrapedAt']
+            if pd.api.types.is_datetime64_any_dtype(scraped_at):
+                scrape_date = scraped_at.dt.strftime('%Y-%m-%d')
+            else:
+                scrape_date = scraped_at.astype(str).str.slice(stop=10)
+            df = df.assign(scrape_date=scrape_date)
+
+        if if_exists == 'replace' and os.path.isdir(path):
+            shutil.rmtree(path)
+        before = _path_size(path) if os.path.isdir(path) else 0
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        file_format = pa_dataset.ParquetFileFormat()
+        pa_dataset.write_dataset(
+            table,
+            path,
+            format=file_format,
+            file_options=file_format.make_write_options(compression=compression),
+            partitioning=['scrape_date'] if partition_by_date else None,
+            partitioning_flavor='hive' if partition_by_date else None,
+            max_rows_per_group=row_group_size,
+            min_rows_per_group=min(row_group_size, len(df)),
+            # unique file names, so appends add files next to earlier runs
+            basename_template=f'part-{uuid.uuid4().hex}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+        )
+        print(f"{path} successfully saved as parquet")
+        return LoadResult('parquet', rows=len(df), bytes=_path_size(path) - before)
+    except Exception as e:
+        print(f"Failed to save data to Parquet: {e}")
+        return LoadResult('parquet', error=str(e))
+
+# append one snapshot to the local history store, which is never replaced;
+# a streaming run passes the snapshot_id it opened so all of its chunks land in one snapshot
+def save_to_history(df: pd.DataFrame, path: str = HISTORY_PATH, snapshot_id: int = None):
+    try:
+        before = _path_size(path) if os.path.exists(path) else 0
+        store = HistoryStore(path)
+        try:
+            snapshot_id = store.append(df, snapshot_id)
+        finally:
+            store.close()
+        print(f"{path} successfully appended snapshot {snapshot_id}")
+        return LoadResult('history', rows=len(df), bytes=_path_size(path) - before)
+    except Exception as e:
+        print(f"Failed to save data to the history store: {e}")
+        return LoadResult('history', error=str(e))
+
+def read_parquet(path: str = 'fashion_data_parquet') -> pd.DataFrame:
+    return pa_dataset.dataset(path, format='parquet', partitioning='hive').to_table().to_pandas()
+
 
+# one sheets api client per credential file, built on first use
+CREDENTIAL_FILE = 'etl-fashion-project-460320-9dd4cb557cc2.json'
+
+_sheets_services = {}
+_sheets_lock = threading.Lock()
+
+def get_sheets_service(credential_file: str):
+    with _sheets_lock:
+        service = _sheets_services.get(credential_file)
+        if service is None:
+            creds = Credentials.from_service_account_file(
+                credential_file,
+                scopes=["https://www.googleapis.com/auth/spreadsheets"]
+            )
+            service = build('sheets', 'v4', credentials=creds)
+            _sheets_services[credential_file] = service
+        return service
+
+SHEETS_CHUNK_ROWS = 500
+SHEETS_SNAPSHOT = '.cache/sheets_snapshot.json'
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index
+
+def _column_letters(index: int) -> str:
+    letters = ''
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(ord('A') + rest) + letters
+    return letters
+
+# 'Sheet1!B3' -> ('Sheet1!', 'B', 3)
+def _split_range(range_name: str):
+    match = re.match(r"^(?:(?P<sheet>.+)!)?(?P<col>[A-Z]+)(?P<row>\d+)", range_name)
+    if match is None:
+        raise ValueError(f"Unsupported range: {range_name}")
+    prefix = f"{match.group('sheet')}!" if match.group('sheet') else ''
+    return prefix, match.group('col'), int(match.group('row'))
+
+def _row_hash(row) -> str:
+    return hashlib.sha1(json.dumps(row, default=str).encode('utf-8')).hexdigest()[:16]
+
+def _load_snapshot(path: str, key: str):
+    try:
+        with open(path) as f:
+            return json.load(f).get(key)
+    except (OSError, ValueError):
+        return None
+
+def _save_snapshot(path: str, key: str, hashes: list):
+    try:
+        with open(path) as f:
+            snapshots = json.load(f)
+    except (OSError, ValueError):
+        snapshots = {}
+    snapshots[key] = hashes
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(snapshots, f)
+
+# contiguous runs of changed rows, each at most chunk_rows long
+def _changed_segments(rows: list, hashes: list, previous: list, chunk_rows: int):
+    segments = []
+    start = None
+    for i, digest in enumerate(hashes + [None]):
+        changed = i < len(hashes) and (i >= len(previous) or previous[i] != digest)
+        if changed and start is None:
+            start = i
+        if start is not None and (not changed or i - start == chunk_rows):
+            segments.append((start, rows[start:i]))
+            start = i if changed else None
+    return segments
+
+# write segments with values().batchUpdate, at most chunk_rows rows per request
+def _batch_write(sheet_values, spreadsheet_id: str, range_name: str, segments: list, chunk_rows: int):
+    prefix, col, first_row = _split_range(range_name)
+    requests_sent = 0
+    payload = 0
+    data, rows_in_request = [], 0
+
+    def flush():
+        nonlocal requests_sent, payload, data, rows_in_request
+        if not data:
+            return
+        body = {'valueInputOption': 'RAW', 'data': data}
+        sheet_values.batchUpdate(spreadsheetId=spreadsheet_id, body=body).execute()
+        requests_sent += 1
+        payload += len(json.dumps(body))
+        data, rows_in_request = [], 0
+
+    for start, rows in segments:
+        if rows_in_request + len(rows) > chunk_rows:
+            flush()
+        data.append({'range': f"{prefix}{col}{first_row + start}", 'values': rows})
+        rows_in_request += len(rows)
+    flush()
+    return requests_sent, payload
 
 # save to google sheets
 def save_to_google_spreadsheet(
     df: pd.DataFrame,
     spreadsheet_id: str = '1JAnu0DVGOaoWZSxZ-q1s6M-2KtIAH16JT6_yzoZNAQs',
     range_name: str = 'Sheet1!A1',
-    credential_file: str = 'etl-fashion-project-460320-9dd4cb557cc2.json'
+    credential_file: str = CREDENTIAL_FILE,
+    if_exists: str = 'replace',
+    diff: bool = False,
+    chunk_rows: int = SHEETS_CHUNK_ROWS,
+    snapshot_path: str = None
 ):
     try:
-        creds = Credentials.from_service_account_file(
-            credential_file,
-            scopes=["https://www.googleapis.com/auth/spreadsheets"]
-        )
-        service = build('sheets', 'v4', credentials=creds)
+        snapshot_path = snapshot_path or SHEETS_SNAPSHOT
+        sheet_values = get_sheets_service(credential_file).spreadsheets().values()
+        df = _text_frame(df)
+        snapshot_key = f"{spreadsheet_id}/{range_name}"
+        previous = _load_snapshot(snapshot_path, snapshot_key) if (diff or if_exists == 'append') else None
 
-        # clear spreadsheets
-        service.spreadsheets().values().clear(
-            spreadsheetId=spreadsheet_id,
-            range=range_name,
-        ).execute()
+        # append only the new rows below the existing data
+        if if_exists == 'append':
+            rows = df.values.tolist()
+            payload = 0
+            for offset in range(0, len(rows), chunk_rows):
+                body = {'values': rows[offset:offset + chunk_rows]}
+                sheet_values.append(
+                    spreadsheetId=spreadsheet_id,
+                    range=range_name,
+                    valueInputOption="RAW",
+                    insertDataOption="INSERT_ROWS",
+                    body=body
+                ).execute()
+                payload += len(json.dumps(body))
+            if previous is not None:
+                _save_snapshot(snapshot_path, snapshot_key, previous + [_row_hash(row) for row in rows])
+            print(f"Successfully appended {len(df)} rows to Spreadsheet.")
+            return LoadResult('sheets', rows=len(df), bytes=payload)
 
         # format data
         values = [df.columns.tolist()] + df.values.tolist()
-        body = {'values': values}
+        hashes = [_row_hash(row) for row in values]
 
-        # input data to spreadsheets
-        service.spreadsheets().values().update(
-            spreadsheetId=spreadsheet_id,
-            range=range_name,
-            valueInputOption="RAW",
-            body=body
-        ).execute()
+        if diff and previous is not None:
+            # only rewrite the rows that changed since the last snapshot
+            segments = _changed_segments(values, hashes, previous, chunk_rows)
+            if len(previous) > len(values):
+                prefix, col, first_row = _split_range(range_name)
+                last_col = _column_letters(_column_index(col) + len(df.columns) - 1)
+                sheet_values.clear(
+                    spreadsheetId=spreadsheet_id,
+                    range=f"{prefix}{col}{first_row + len(values)}:{last_col}{first_row + len(previous) - 1}",
+                ).execute()
+        else:
+            # clear spreadsheets, every row of the written columns
+            prefix, col, first_row = _split_range(range_name)
+            last_col = _column_letters(_column_index(col) + len(df.columns) - 1)
+            sheet_values.clear(
+                spreadsheetId=spreadsheet_id,
+                range=f"{prefix}{col}{first_row}:{last_col}",
+            ).execute()
+            segments = _changed_segments(values, hashes, [], chunk_rows)
 
-        print(f"Successfully saved to Spreadsheet.")
+        requests_sent, payload = _batch_write(sheet_values, spreadsheet_id, range_name, segments, chunk_rows)
+        _save_snapshot(snapshot_path, snapshot_key, hashes)
+
+        # data rows only, the header is row 0 of the first segment when it was rewritten
+        changed = sum(len(rows) for _, rows in segments) - (1 if segments and segments[0][0] == 0 else 0)
+        print(f"Successfully saved to Spreadsheet ({changed} rows written in {requests_sent} requests).")
+        return LoadResult('sheets', rows=changed, bytes=payload)
     except Exception as e:
         print(f"Failed to save to Spreadsheets: {e}")
+        return LoadResult('sheets', error=str(e))
+
+DESTINATIONS = ('csv', 'parquet', 'history', 'postgresql', 'sheets')
+DEFAULT_DESTINATIONS = ('csv', 'postgresql', 'sheets')
+DEFAULT_TIMEOUT = 120
+
+def check_destinations(destinations):
+    unknown = [name for name in destinations if name not in DESTINATIONS]
+    if unknown:
+        raise ValueError(f"Unknown load destinations: {', '.join(unknown)} (expected any of {', '.join(DESTINATIONS)})")
 
 # load to all storages
 def load_data(
@@ -74,8 +526,108 @@ def load_data(
     password: str = 'wafanur444',
     spreadsheet_id: str = '1JAnu0DVGOaoWZSxZ-q1s6M-2KtIAH16JT6_yzoZNAQs',
     range_name: str = 'Sheet1!A1',
-    table_name: str = 'products'
-):
-    save_to_csv(df, filename_csv)
-    save_to_postgresql(df, db_name, user, password, table_name=table_name)
-    save_to_google_spreadsheet(df, spreadsheet_id, range_name)
\ No newline at end of file
+    table_name: str = 'products',
+    if_exists: str = 'replace',
+    pg_method: str = 'copy',
+    destinations: tuple = DEFAULT_DESTINATIONS,
+    db_host: str = 'localhost',
+    db_port: int = 5432,
+    credential_file: str = CREDENTIAL_FILE,
+    history_path: str = HISTORY_PATH,
+    history_snapshot: int = None,
+    parquet_path: str = 'fashion_data_parquet',
+    timeouts: dict = None,
+    sheets_diff: bool = False
+) -> LoadReport:
+    check_destinations(destinations)
+    savers = {
+        'csv': lambda: save_to_csv(df, filename_csv, if_exists=if_exists),
+        'parquet': lambda: save_to_parquet(df, parquet_path, if_exists=if_exists),
+        'history': lambda: save_to_history(df, history_path, history_snapshot),
+        'postgresql': lambda: (
+            save_to_postgresql_copy(df, db_name, user, password, db_host, db_port, table_name=table_name, if_exists=if_exists)
+            if pg_method == 'copy' else
+            save_to_postgresql(df, db_name, user, password, db_host, db_port, table_name=table_name, if_exists=if_exists)
+        ),
+        'sheets': lambda: save_to_google_spreadsheet(
+            df, spreadsheet_id, range_name, credential_file, if_exists=if_exists, diff=sheets_diff
+        ),
+    }
+    timeouts = timeouts or {}
+    with metrics.stage('load'):
+        report = _fan_out({name: savers[name] for name in destinations}, timeouts, len(df))
+    metrics.record_load(report)
+    return report
+
+# every destination on its own thread, a slow or failing one does not hold up the rest
+def _fan_out(savers: dict, timeouts: dict, rows: int) -> LoadReport:
+    started = time.perf_counter()
+    report = LoadReport()
+    if not savers:
+        return report
+
+    def run(name, saver):
+        start = time.perf_counter()
+        try:
+            result = saver()
+        except Exception as e:
+            result = LoadResult(name, error=str(e))
+        if not isinstance(result, LoadResult):
+            result = LoadResult(name, rows=rows)
+        result.destination = name
+        result.duration = time.perf_counter() - start
+        return result
+
+    executor = ThreadPoolExecutor(max_workers=len(savers), thread_name_prefix='load')
+    futures = {name: executor.submit(run, name, saver) for name, saver in savers.items()}
+    for name, future in futures.items():
+        # each timeout counts from the start of the fan-out
+        timeout = timeouts.get(name, DEFAULT_TIMEOUT)
+        remaining = None if timeout is None else max(0.0, timeout - (time.perf_counter() - started))
+        try:
+            report.results.append(future.result(timeout=remaining))
+        except FutureTimeout:
+            print(f"Loading to {name} timed out after {timeout}s")
+            report.results.append(LoadResult(name, duration=timeout, error=f"timed out after {timeout}s", timed_out=True))
+    # do not wait for timed-out destinations, their threads finish in the background
+    executor.shutdown(wait=False)
+    report.duration = time.perf_counter() - started
+    return report
+
+def _new_history_snapshot(path: str) -> int:
+    try:
+        store = HistoryStore(path)
+        try:
+            return store.new_snapshot()
+        finally:
+            store.close()
+    except Exception as e:
+        print(f"Failed to open a history snapshot: {e}")
+        return None
+
+# load a stream of chunks, the first non-empty chunk replaces and the rest append;
+# the returned report sums every chunk per destination, so callers can tell whether all of them landed
+def load_data_stream(chunks, if_exists: str = 'replace', destinations: tuple = DEFAULT_DESTINATIONS, **kwargs) -> LoadReport:
+    report = LoadReport()
+    total = 0
+    # a timed-out write keeps running in the background, later chunks must not race it on the same sink
+    timed_out = set()
+    # the whole run is one history snapshot, opened with the first chunk
+    snapshot_id = None
+    for df in chunks:
+        if df is None or df.empty:
+            continue
+        active = tuple(name for name in destinations if name not in timed_out)
+        if 'history' in active and snapshot_id is None:
+            snapshot_id = _new_history_snapshot(kwargs.get('history_path', HISTORY_PATH))
+        chunk_report = load_data(df, if_exists=if_exists, destinations=active, history_snapshot=snapshot_id, **kwargs)
+        for name in timed_out:
+            chunk_report.results.append(LoadResult(name, error="skipped, an earlier chunk timed out"))
+        timed_out.update(result.destination for result in chunk_report.results if result.timed_out)
+        report.add(chunk_report)
+        if_exists = 'append'
+        total += len(df)
+        print(f"Loaded chunk of {len(df)} rows ({total} total).")
+        for result in chunk_report.failed:
+            print(f"Chunk failed for {result.destination}: {result.error}")
+    return report
@@ -0,0 +1,136 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+# posix only, peak_rss() is None on platforms without it (windows)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# per-stage timers and counters for one pipeline run, shared by every module
+class RunMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started_at = datetime.now()
+            self.started = time.perf_counter()
+            self.timers = defaultdict(float)
+            self.counters = defaultdict(int)
+            self.destinations = {}
+
+    def add_time(self, name: str, seconds: float):
+        with self.lock:
+            self.timers[name] += seconds
+
+    def incr(self, name: str, value: int = 1):
+        with self.lock:
+            self.counters[name] += value
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.timers), dict(self.counters)
+
+    # fold in what a worker process measured since its snapshot
+    def merge(self, timers: dict, counters: dict):
+        with self.lock:
+            for name, seconds in timers.items():
+                self.timers[name] += seconds
+            for name, value in counters.items():
+                self.counters[name] += value
+
+    # streaming runs load chunk by chunk, so destinations accumulate across reports
+    def record_load(self, report):
+        with self.lock:
+            for result in report.results:
+                totals = self.destinations.setdefault(
+                    result.destination, {'rows': 0, 'bytes': 0, 'duration': 0.0, 'error': None}
+                )
+                totals['rows'] += result.rows
+                totals['bytes'] += result.bytes
+                totals['duration'] = round(totals['duration'] + result.duration, 4)
+                totals['error'] = result.error or totals['error']
+
+    def report(self) -> dict:
+        with self.lock:
+            return {
+                'started_at': self.started_at.isoformat(),
+                'duration': round(time.perf_counter() - self.started, 4),
+                'timers': {name: round(seconds, 4) for name, seconds in sorted(self.timers.items())},
+                'counters': dict(sorted(self.counters.items())),
+                'destinations': dict(self.destinations),
+                'peak_rss_bytes': peak_rss(),
+            }
+
+
+def delta(before: tuple, after: tuple):
+    timers = {name: seconds - before[0].get(name, 0.0) for name, seconds in after[0].items()}
+    counters = {name: value - before[1].get(name, 0) for name, value in after[1].items()}
+    return (
+        {name: seconds for name, seconds in timers.items() if seconds},
+        {name: value for name, value in counters.items() if value},
+    )
+
+def peak_rss() -> int:
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports KiB, macOS bytes
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+
+metrics = RunMetrics()
+
+
+# wraps a whole run: resets metrics, optionally profiles, and writes the json report
+@contextmanager
+def instrumented_run(report_path: str = None, profile_path: str = None, trace_memory: bool = False, top: int = 10):
+    metrics.reset()
+    profiler = cProfile.Profile() if profile_path else None
+    if trace_memory:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield metrics
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+        report = metrics.report()
+        if profile_path:
+            report['profile'] = profile_path
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            report['tracemalloc'] = {
+                'peak_bytes': tracemalloc.get_traced_memory()[1],
+                'top': [
+                    {'where': str(stat.traceback), 'bytes': stat.size, 'count': stat.count}
+                    for stat in snapshot.statistics('lineno')[:top]
+                ],
+            }
+            tracemalloc.stop()
+        if report_path:
+            if os.path.dirname(report_path):
+                os.makedirs(os.path.dirname(report_path), exist_ok=True)
+            with open(report_path, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"Run report written to {report_path}")
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ('Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender')
+
+
+# the products of one page as column lists, every card of the page shares one scrape timestamp
+class PageRecords:
+    __slots__ = ('scraped_at',) + FIELDS
+
+    def __init__(self, scraped_at: datetime = None):
+        self.scraped_at = scraped_at or datetime.now()
+        for field in FIELDS:
+            setattr(self, field, [])
+
+    # values in FIELDS order, as returned by the card readers
+    def append(self, values: tuple):
+        for field, value in zip(FIELDS, values):
+            getattr(self, field).append(value)
+
+    def __len__(self):
+        return len(self.Title)
+
+    # one value tuple per product, in FIELDS order
+    def rows(self):
+        return zip(*(getattr(self, field) for field in FIELDS))
+
+    # one dict per product, for code that works product by product
+    def __iter__(self):
+        for values in self.rows():
+            product = dict(zip(FIELDS, values))
+            product['ScrapedAt'] = self.scraped_at
+            yield product
+
+    # keep is called with the value tuple of each product, no dict is built
+    def filter(self, keep) -> 'PageRecords':
+        kept = PageRecords(self.scraped_at)
+        for values in self.rows():
+            if keep(values):
+                kept.append(values)
+        return kept
+
+    def as_dict(self) -> dict:
+        return {'ScrapedAt': self.scraped_at.isoformat(), **{field: getattr(self, field) for field in FIELDS}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PageRecords':
+        records = cls(datetime.fromisoformat(data['ScrapedAt']))
+        for field in FIELDS:
+            setattr(records, field, list(data[field]))
+        return records
+
+
+# straight from the column lists to a frame, no dict per product; the page timestamp is broadcast
+def records_to_frame(pages) -> pd.DataFrame:
+    pages = [page for page in pages if len(page)]
+    columns = {field: [] for field in FIELDS}
+    for page in pages:
+        for field in FIELDS:
+            columns[field].extend(getattr(page, field))
+    stamps = np.array([np.datetime64(page.scraped_at, 'ns') for page in pages], dtype='datetime64[ns]')
+    columns['ScrapedAt'] = np.repeat(stamps, [len(page) for page in pages])
+    return pd.DataFrame({
+        name: pd.Series(values, dtype='datetime64[ns]' if name == 'ScrapedAt' else object)
+        for name, values in columns.items()
+    })
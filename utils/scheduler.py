@@ -0,0 +1,20 @@
+import time
+
+# fixed-rate loop: each run starts `every` seconds after the previous one started,
+# a run that overruns its slot is followed by the next one straight away
+def run_every(job, every: float, runs: int = None, clock=time.monotonic, sleep=time.sleep) -> int:
+    count = 0
+    next_start = clock()
+    while runs is None or count < runs:
+        count += 1
+        print(f"Scheduled run {count} starting.")
+        try:
+            job()
+        except Exception as e:
+            # one failed run does not stop the schedule
+            print(f"Scheduled run {count} failed: {e}")
+        if runs is not None and count >= runs:
+            break
+        next_start = max(next_start + every, clock())
+        sleep(max(0.0, next_start - clock()))
+    return count
@@ -0,0 +1,117 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+
+import pandas as pd
+
+from utils.archive import PageArchive
+from utils.cache import PageCache
+from utils.checkpoint import CrawlCheckpoint
+from utils.extract import scrape_fashion_frame
+from utils.metrics import metrics
+from utils.state import IncrementalState
+from utils.transform import clean_and_transform
+from utils.validate import Quarantine
+
+# contiguous, near-equal page ranges covering start_page..pages
+def shard_ranges(start_page: int, pages: int, shards: int) -> list:
+    total = pages - start_page + 1
+    shards = max(1, min(shards, total))
+    size, extra = divmod(total, shards)
+    ranges = []
+    first = start_page
+    for n in range(shards):
+        last = first + size + (1 if n < extra else 0) - 1
+        ranges.append((first, last))
+        first = last + 1
+    return ranges
+
+# one checkpoint file per range, so shards never share a writer and --resume finds its own
+def shard_checkpoint_path(start_page: int, pages: int) -> str:
+    return f'.cache/checkpoint-{start_page}-{pages}.sqlite'
+
+# every shard paces its own fetches, so each gets 1/N of the run's rate
+def shard_rate(config) -> float:
+    rate = config.rate_limit or (1 / config.delay if config.delay else None)
+    return rate / config.shards if rate else None
+
+
+@dataclass
+class ShardResult:
+    start_page: int
+    pages: int
+    data: pd.DataFrame
+    quarantine: Quarantine
+    products: int = 0
+    pending_pages: dict = field(default_factory=dict)
+    pending_products: dict = field(default_factory=dict)
+    cache_summary: str = ''
+    metrics: tuple = ({}, {})
+
+
+# runs in a worker process: crawl and clean one page range, the parent loads everything once
+def crawl_shard(config, start_page: int, pages: int) -> ShardResult:
+    # a forked worker starts from the parent's counters
+    metrics.reset()
+    cache = PageCache()
+    state = IncrementalState() if config.incremental else None
+    checkpoint = CrawlCheckpoint(shard_checkpoint_path(start_page, pages), resume=config.resume)
+    archive = PageArchive(config.replay) if config.replay else None
+    try:
+        products = scrape_fashion_frame(
+            pages,
+            start_page=start_page,
+            delay=config.delay,
+            concurrency=config.concurrency,
+            # the host's request budget, 1/delay unless set, is shared between the shards
+            rate_limit=shard_rate(config),
+            cache=cache,
+            state=state,
+            parser=config.parser,
+            checkpoint=checkpoint,
+            archive=archive,
+        )
+        quarantine = Quarantine()
+        data = clean_and_transform(products, quarantine=quarantine) if not products.empty else pd.DataFrame()
+        return ShardResult(
+            start_page,
+            pages,
+            data,
+            quarantine,
+            products=len(products),
+            pending_pages=dict(state.pending_pages) if state is not None else {},
+            pending_products=dict(state.pending_products) if state is not None else {},
+            cache_summary=cache.summary(),
+            metrics=metrics.snapshot(),
+        )
+    finally:
+        checkpoint.close()
+        cache.close()
+        if state is not None:
+            state.close()
+        if archive is not None:
+            archive.close()
+
+# crawl every range on its own process and merge the cleaned frames in page order
+def run_shards(config) -> list:
+    ranges = shard_ranges(config.start_page, config.pages, config.shards)
+    print(f"Crawling {len(ranges)} shards: " + ', '.join(f"{first}-{last}" for first, last in ranges))
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        results = list(executor.map(
+            crawl_shard, repeat(config), [first for first, _ in ranges], [last for _, last in ranges]
+        ))
+    for result in results:
+        metrics.merge(*result.metrics)
+        print(f"Shard {result.start_page}-{result.pages}: {result.products} products, page cache {result.cache_summary}")
+    return results
+
+def merge_shards(results: list) -> pd.DataFrame:
+    frames = [result.data for result in results if not result.data.empty]
+    if not frames:
+        return pd.DataFrame()
+    data = pd.concat(frames, ignore_index=True)
+    # the same product can appear in two ranges
+    rows = len(data)
+    data = data.drop_duplicates(ignore_index=True)
+    metrics.incr('rejected.duplicates', rows - len(data))
+    return data
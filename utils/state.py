@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+DEFAULT_STATE_PATH = '.cache/state.sqlite'
+PRODUCT_FIELDS = ('Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender')
+
+def page_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+def product_hash(product: dict) -> str:
+    return values_hash(tuple(product.get(field, '') for field in PRODUCT_FIELDS))
+
+# same digest as product_hash, from the values in PRODUCT_FIELDS order
+def values_hash(values: tuple) -> str:
+    values = [str(value) for value in values]
+    return hashlib.sha256(json.dumps(values, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+# remembers page and product hashes between runs, for incremental extraction
+class IncrementalState:
+    def __init__(self, path: str = DEFAULT_STATE_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, hash TEXT NOT NULL, updated_at TEXT NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS products (hash TEXT PRIMARY KEY, url TEXT, first_seen TEXT NOT NULL)")
+        self.conn.commit()
+        # changes are only written by commit(), after the delta has been loaded
+        self.pending_pages = {}
+        self.pending_products = {}
+        self.pages_skipped = 0
+        self.products_skipped = 0
+
+    def page_changed(self, url: str, body: bytes) -> bool:
+        digest = page_hash(body)
+        with self.lock:
+            row = self.conn.execute("SELECT hash FROM pages WHERE url = ?", (url,)).fetchone()
+            if row is not None and row[0] == digest:
+                self.pages_skipped += 1
+                return False
+            self.pending_pages[url] = digest
+            return True
+
+    def product_changed(self, product: dict, url: str = None) -> bool:
+        return self._digest_changed(product_hash(product), url)
+
+    # page records hash their column values directly
+    def values_changed(self, values: tuple, url: str = None) -> bool:
+        return self._digest_changed(values_hash(values), url)
+
+    def _digest_changed(self, digest: str, url: str) -> bool:
+        with self.lock:
+            if digest in self.pending_products:
+                self.products_skipped += 1
+                return False
+            row = self.conn.execute("SELECT 1 FROM products WHERE hash = ?", (digest,)).fetchone()
+            if row is not None:
+                self.products_skipped += 1
+                return False
+            self.pending_products[digest] = url
+            return True
+
+    def commit(self):
+        now = datetime.now().isoformat()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pages (url, hash, updated_at) VALUES (?, ?, ?)",
+                [(url, digest, now) for url, digest in self.pending_pages.items()],
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO products (hash, url, first_seen) VALUES (?, ?, ?)",
+                [(digest, url, now) for digest, url in self.pending_products.items()],
+            )
+            self.conn.commit()
+            self.pending_pages.clear()
+            self.pending_products.clear()
+
+    def summary(self) -> str:
+        return f"{self.pages_skipped} unchanged pages skipped, {self.products_skipped} unchanged products skipped"
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -1,59 +1,159 @@
+import re
 import pandas as pd
 import numpy as np
+from utils.metrics import metrics
+from utils.records import PageRecords, records_to_frame
+from utils.validate import OPTIONAL, Quarantine, validate
 
-def clean_and_transform(product_data: pd.DataFrame) -> pd.DataFrame:
+COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'ScrapedAt']
+USD_TO_IDR = 16000
+
+PRICE_JUNK = re.compile(r'[^\d.]')
+RATING_NUMBER = re.compile(r'(\d+\.\d+|\d+)')
+COLORS_NUMBER = re.compile(r'(\d+)')
+SIZE_PREFIX = re.compile(r'Size:\s*')
+GENDER_PREFIX = re.compile(r'Gender:\s*')
+
+# run a string parser once per distinct value and broadcast the result through the codes,
+# the catalogue repeats the same prices, ratings, sizes and genders over and over
+def _parse_distinct(series: pd.Series, parse) -> pd.Series:
+    if pd.api.types.infer_dtype(series, skipna=True) != 'string':
+        return parse(series.astype(str))
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return parse(series.astype(str))
+    values = parse(pd.Series(uniques, dtype=object)).to_numpy()
+    result = values[codes]
+    missing = codes == -1
+    if missing.any():
+        # missing cells are stringified ('nan', 'None') exactly like astype(str)
+        filled = parse(series[missing].astype(str)).to_numpy()
+        result = result.astype(np.result_type(result, filled))
+        result[missing] = filled
+    return pd.Series(result, index=series.index)
+
+def _to_number(series: pd.Series, pattern: re.Pattern) -> pd.Series:
+    return _parse_distinct(
+        series, lambda s: pd.to_numeric(s.str.extract(pattern, expand=False), errors='coerce')
+    )
+
+def _strip_prefix(series: pd.Series, pattern: re.Pattern) -> pd.Series:
+    return _parse_distinct(series, lambda s: s.str.replace(pattern, '', regex=True))
+
+# same text as strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3], formatted by numpy instead of row by row
+def iso_millis(timestamps: pd.Series) -> pd.Series:
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_localize(None)
+    values = timestamps.to_numpy(dtype='datetime64[ns]').astype('datetime64[ms]')
+    return pd.Series(np.datetime_as_string(values, unit='ms'), index=timestamps.index, dtype=object)
+
+def memory_usage(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True).sum())
+
+# compact opt-in schema: categorical size/gender, int8 colors, float32 rating, datetime64 scrapedat
+def apply_typed_schema(df: pd.DataFrame) -> pd.DataFrame:
+    before = memory_usage(df)
+    df = df.copy(deep=False)
+    df['Rating'] = df['Rating'].astype('float32')
+    df['Colors'] = pd.to_numeric(df['Colors'], downcast='integer')
+    df['Size'] = df['Size'].astype('category')
+    df['Gender'] = df['Gender'].astype('category')
+    if not pd.api.types.is_datetime64_any_dtype(df['ScrapedAt']):
+        df['ScrapedAt'] = pd.to_datetime(df['ScrapedAt'], format='ISO8601')
+    after = memory_usage(df)
+    print(f"[Transform] Typed schema memory: {before / 1024:.1f} KiB -> {after / 1024:.1f} KiB")
+    return df
+
+def clean_and_transform(product_data: pd.DataFrame, typed: bool = False, quarantine: Quarantine = None) -> pd.DataFrame:
+    with metrics.stage('transform'):
+        return _clean_and_transform(product_data, typed, quarantine)
+
+def _clean_and_transform(product_data, typed, quarantine):
     if isinstance(product_data, list):
         product_data = pd.DataFrame(product_data)
         
     if product_data.empty:
         print("[Transform] Product data is empty, returning empty DataFrame.")
-        return pd.DataFrame(columns=['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'ScrapedAt'])
+        return pd.DataFrame(columns=COLUMNS)
 
     try:
-        df = pd.DataFrame(product_data)
+        # normalize column names without copying the caller's frame
+        source = {col.strip(): product_data[col] for col in product_data.columns}
 
-        # normalize column names
-        df.columns = [col.strip() for col in df.columns]
-
-        # filter invalid data 
-        if 'Title' in df.columns:
-            df = df[~df['Title'].str.lower().str.contains('unknown', na=False)]
+        metrics.incr('rows_in', len(product_data))
 
         # convert price column to float (1$ = 16,000 IDR)
-        df['Price'] = df['Price'].astype(str).str.replace(r'[^\d.]', '', regex=True)
-        df['Price'].replace('', np.nan)
-        df.dropna(subset=['Price'], inplace=True)
-        df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
-        df.dropna(subset=['Price'], inplace=True)
-        df['Price'] = (df['Price'] * 16000).round(1)
+        price = _parse_distinct(
+            source['Price'], lambda s: pd.to_numeric(s.str.replace(PRICE_JUNK, '', regex=True), errors='coerce')
+        )
 
         # convert rating column to float
-        df['Rating'] = df['Rating'].astype(str).str.extract(r'(\d+\.\d+|\d+)')[0]
-        df['Rating'].replace('', np.nan)
-        df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce').astype(float)
-        df.dropna(subset=['Rating'], inplace=True)
+        rating = _to_number(source['Rating'], RATING_NUMBER)
 
         # convert colors column to integer
-        df['Colors'] = df['Colors'].astype(str).str.extract(r'(\d+)')[0]
-        df['Colors'].replace('', np.nan)
-        df['Colors'] = pd.to_numeric(df['Colors'], errors='coerce')
-        df.dropna(subset=['Colors'], inplace=True)
+        colors = _to_number(source['Colors'], COLORS_NUMBER)
+
+        # convert scrapedat column to datetime
+        scraped_at = pd.to_datetime(source['ScrapedAt'], errors='coerce')
+
+        # every validation rule over the parsed columns, rejected rows go to quarantine with their reasons
+        parsed = {'Price': price, 'Rating': rating, 'Colors': colors, 'ScrapedAt': scraped_at}
+        columns = {name: parsed.get(name, series) for name, series in source.items()}
+        valid, failures = validate(columns)
+        if quarantine is not None and not valid.all():
+            quarantine.add(product_data[~valid], failures, ~valid)
+        df = pd.DataFrame({name: series[valid] for name, series in columns.items()})
+
+        df['Price'] = (df['Price'].astype(float) * USD_TO_IDR).round(1)
+        df['Rating'] = df['Rating'].astype(float)
+        df['Colors'] = df['Colors'].astype('int64')
 
-        # convert size and gender columns to string
-        df['Size'] = df['Size'].astype(str).str.replace(r'Size:\s*', '', regex=True)
-        df['Gender'] = df['Gender'].astype(str).str.replace(r'Gender:\s*', '', regex=True)
+        # convert size and gender columns to string, missing ones are stored as 'Unknown'
+        df['Size'] = _strip_prefix(df['Size'].fillna(OPTIONAL['Size']), SIZE_PREFIX)
+        df['Gender'] = _strip_prefix(df['Gender'].fillna(OPTIONAL['Gender']), GENDER_PREFIX)
 
-        # convert scrapedat column to datetime 
-        df['ScrapedAt'] = pd.to_datetime(df['ScrapedAt'], errors='coerce')
-        df.dropna(subset=['ScrapedAt'], inplace=True)
-        df['ScrapedAt'] = df['ScrapedAt'].dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str.slice(stop=-3)
+        # typed output keeps a native timestamp, at the same millisecond precision
+        if typed:
+            df['ScrapedAt'] = df['ScrapedAt'].dt.floor('ms')
+        else:
+            df['ScrapedAt'] = iso_millis(df['ScrapedAt'])
 
-        # drop duplicates and missing values
+        # drop duplicates
+        rows = len(df)
         df.drop_duplicates(inplace=True)
-        df.dropna(inplace=True)
+        metrics.incr('rejected.duplicates', rows - len(df))
+
+        if typed:
+            df = apply_typed_schema(df)
 
     except Exception as e:
         print(f"[Transform] Error occurred during data transformation: {e}")
+        metrics.incr('transform_errors')
         return pd.DataFrame()
 
-    return df
\ No newline at end of file
+    metrics.incr('rows_out', len(df))
+    return df
+
+
+# page records go to a frame column by column, plain product lists row by row
+def _as_frame(batch) -> pd.DataFrame:
+    if isinstance(batch, PageRecords):
+        return records_to_frame([batch])
+    return pd.DataFrame(batch)
+
+# regroup page-sized batches into fixed-size chunks and clean each one
+def transform_chunks(product_batches, chunk_size: int = 200, typed: bool = False, quarantine: Quarantine = None):
+    buffer = []
+    rows = 0
+    for batch in product_batches:
+        if not len(batch):
+            continue
+        buffer.append(_as_frame(batch))
+        rows += len(batch)
+        while rows >= chunk_size:
+            frame = pd.concat(buffer, ignore_index=True) if len(buffer) > 1 else buffer[0]
+            chunk, rest = frame.iloc[:chunk_size], frame.iloc[chunk_size:].reset_index(drop=True)
+            buffer, rows = ([rest] if len(rest) else []), len(rest)
+            yield clean_and_transform(chunk, typed, quarantine)
+    if rows:
+        yield clean_and_transform(pd.concat(buffer, ignore_index=True), typed, quarantine)
@@ -0,0 +1,104 @@
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import metrics
+
+QUARANTINE_PATH = 'quarantine.csv'
+
+# a rule passes a row when check(columns) is True for it, columns being the parsed frame columns
+Rule = namedtuple('Rule', ['name', 'column', 'check', 'description'])
+
+def _not_blank(series: pd.Series) -> pd.Series:
+    return series.notna() & (series.astype(str).str.strip() != '')
+
+RULES = (
+    Rule('title_missing', 'Title', lambda c: _not_blank(c['Title']), 'no product title'),
+    Rule('title_unknown', 'Title', lambda c: ~c['Title'].str.contains('unknown', case=False, regex=False, na=False),
+         'placeholder "Unknown" product'),
+    Rule('price_invalid', 'Price', lambda c: c['Price'].notna(), 'price is missing or not a number'),
+    Rule('rating_invalid', 'Rating', lambda c: c['Rating'].notna(), 'rating is missing or not a number'),
+    Rule('colors_invalid', 'Colors', lambda c: c['Colors'].notna(), 'color count is missing or not a number'),
+    Rule('scraped_at_invalid', 'ScrapedAt', lambda c: c['ScrapedAt'].notna(), 'timestamp is missing or unparseable'),
+)
+
+# columns that may be missing, with the value stored instead
+OPTIONAL = {'Size': 'Unknown', 'Gender': 'Unknown'}
+
+# any other column must simply be present
+MISSING_VALUE = 'missing_value'
+
+
+# evaluates every rule over whole columns, returns the combined mask and one failure mask per rule
+def validate(columns: dict, rules: tuple = RULES):
+    rows = len(next(iter(columns.values()))) if columns else 0
+    failures = {}
+    for rule in rules:
+        if rule.column in columns:
+            failures[rule.name] = ~np.asarray(rule.check(columns), dtype=bool)
+    checked = {rule.column for rule in rules}
+    missing = np.zeros(rows, dtype=bool)
+    for name, series in columns.items():
+        if name not in checked and name not in OPTIONAL:
+            missing |= series.isna().to_numpy()
+    failures[MISSING_VALUE] = missing
+
+    rejected = np.zeros(rows, dtype=bool)
+    for name, failed in failures.items():
+        rejected |= failed
+        metrics.incr(f'rejected.{name}', int(failed.sum()))
+    return ~rejected, failures
+
+# comma-separated names of the rules each rejected row failed
+def reasons(failures: dict, rejected: np.ndarray) -> np.ndarray:
+    result = np.full(int(rejected.sum()), '', dtype=object)
+    for name, failed in failures.items():
+        hit = failed[rejected]
+        result[hit] = np.where(result[hit] == '', name, result[hit] + ',' + name)
+    return result
+
+
+# rejected rows with their reasons, collected across chunks and saved once at the end
+class Quarantine:
+    def __init__(self):
+        self.frames = []
+        self.counts = {}
+
+    def add(self, rows: pd.DataFrame, failures: dict, rejected: np.ndarray):
+        if rows.empty:
+            return
+        self.frames.append(rows.assign(Reason=reasons(failures, rejected)))
+        for name, failed in failures.items():
+            count = int(failed[rejected].sum())
+            if count:
+                self.counts[name] = self.counts.get(name, 0) + count
+
+    # folds in the rows quarantined by another process
+    def extend(self, other: 'Quarantine'):
+        self.frames.extend(other.frames)
+        for name, count in other.counts.items():
+            self.counts[name] = self.counts.get(name, 0) + count
+
+    def frame(self) -> pd.DataFrame:
+        if not self.frames:
+            return pd.DataFrame(columns=['Reason'])
+        return pd.concat(self.frames)
+
+    def __len__(self):
+        return sum(len(frame) for frame in self.frames)
+
+    def summary(self) -> str:
+        if not self.counts:
+            return "no rows quarantined"
+        counts = ', '.join(f"{name}={count}" for name, count in sorted(self.counts.items()))
+        return f"{len(self)} rows quarantined ({counts})"
+
+    def save(self, filename: str = QUARANTINE_PATH):
+        df = self.frame()
+        if os.path.dirname(filename):
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+        df.to_csv(filename, index=False)
+        print(f"{len(df)} quarantined rows saved to {filename}")
+        return filename